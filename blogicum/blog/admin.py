@@ -1,6 +1,18 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
 
-from .models import Category, Comment, Location, Post
+from . import search
+from .models import Category, Comment, Location, OutboxEmail, Post
+
+
+class PostChangeList(ChangeList):
+
+    def get_ordering(self, request, queryset):
+        """При поиске без явной сортировки сохранить порядок релевантности."""
+        if (self.query and search.is_available()
+                and ORDER_VAR not in self.params):
+            return [*search.RANK_ORDERING, '-pk']
+        return super().get_ordering(request, queryset)
 
 
 @admin.register(Post)
@@ -24,6 +36,14 @@ class PostAdmin(admin.ModelAdmin):
     )
     list_display_links = ('title',)
 
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search.search_posts(queryset, search_term), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -38,3 +58,15 @@ class LocationAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'subject',
+        'recipient',
+        'created_at',
+        'attempts',
+        'sent_at',
+    )
+    list_filter = ('sent_at',)
@@ -0,0 +1,474 @@
+import io
+import sqlite3
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from importlib import import_module
+from typing import Callable
+from urllib.parse import unquote, urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY)
+from django.db import close_old_connections, connection
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+from django.urls import reverse
+
+from blogicum.compression import compress_bytes
+from blogicum.db_backends.sqlite3.base import configure_connection
+
+from .instrumentation import RequestMetrics
+from .models import Comment, Post, User
+from .paginators import encode_cursor
+from .utils import filter_published_posts, get_unfiltred_post
+
+BENCHMARK_HOST = 'testserver'
+REMOTE_ADDR = '10.0.0.1'
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+SQLITE_DEFAULTS = {
+    'timeout': 5,
+    'transaction_mode': None,
+    'pragmas': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    method: str = 'GET'
+    data: dict = field(default_factory=dict)
+    user: User = None
+    headers: dict = field(default_factory=dict)
+    # Для разрушающих запросов: создаёт новый объект и возвращает путь
+    # к нему перед каждым запросом, вне замера.
+    prepare: Callable = None
+
+
+@dataclass
+class BenchmarkClient:
+    """Набор cookie и CSRF-токен для запросов от имени пользователя."""
+
+    cookies: dict = field(default_factory=dict)
+    csrf_token: str = ''
+
+    @classmethod
+    def for_user(cls, user):
+        request = HttpRequest()
+        request.META['SERVER_NAME'] = BENCHMARK_HOST
+        token = get_token(request)
+        client = cls(
+            cookies={settings.CSRF_COOKIE_NAME: request.META['CSRF_COOKIE']},
+            csrf_token=token,
+        )
+        if user is not None:
+            session = import_module(settings.SESSION_ENGINE).SessionStore()
+            session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+            session[BACKEND_SESSION_KEY] = MODEL_BACKEND
+            session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+            session.save()
+            client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        return client
+
+
+def build_environ(scenario, client):
+    url = urlsplit(scenario.path)
+    body = urlencode(scenario.data).encode()
+    environ = {
+        'REQUEST_METHOD': scenario.method,
+        'PATH_INFO': unquote(url.path).encode().decode('iso-8859-1'),
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': BENCHMARK_HOST,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': REMOTE_ADDR,
+        'HTTP_HOST': BENCHMARK_HOST,
+        'HTTP_COOKIE': '; '.join(
+            f'{name}={value}' for name, value in client.cookies.items()
+        ),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    if scenario.method == 'POST':
+        environ['CONTENT_TYPE'] = 'application/x-www-form-urlencoded'
+        environ['CONTENT_LENGTH'] = str(len(body))
+        environ['HTTP_X_CSRFTOKEN'] = client.csrf_token
+    for name, value in scenario.headers.items():
+        environ[f'HTTP_{name.upper().replace("-", "_")}'] = value
+    return environ
+
+
+def call_application(application, environ, keep_body=False):
+    result = {}
+
+    def start_response(status, headers, exc_info=None):
+        result['status'] = int(status.split()[0])
+        result['headers'] = dict(headers)
+
+    response = application(environ, start_response)
+    try:
+        body = b''.join(response)
+        result['size'] = len(body)
+        if keep_body:
+            result['body'] = body
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+    return result
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(share * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_scenario(application, scenario, requests, concurrency=1, warmup=2):
+    client = BenchmarkClient.for_user(scenario.user)
+
+    def one_request(_):
+        current = scenario
+        if scenario.prepare:
+            current = replace(scenario, path=scenario.prepare())
+        metrics = RequestMetrics()
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics):
+                result = call_application(
+                    application, build_environ(current, client)
+                )
+        finally:
+            close_old_connections()
+        result['latency'] = (time.perf_counter() - start) * 1000
+        result['queries'] = metrics.queries
+        return result
+
+    for number in range(warmup):
+        one_request(number)
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(one_request, range(requests)))
+    else:
+        results = [one_request(number) for number in range(requests)]
+    elapsed = time.perf_counter() - start
+    latencies = [result['latency'] for result in results]
+    return {
+        'method': scenario.method,
+        'path': scenario.path,
+        'authenticated': scenario.user is not None,
+        'requests': requests,
+        'concurrency': concurrency,
+        'statuses': sorted({result['status'] for result in results}),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'mean_ms': round(statistics.mean(latencies), 3),
+        'rps': round(requests / elapsed, 2),
+        'queries_per_request': round(
+            statistics.mean(result['queries'] for result in results), 2
+        ),
+        'bytes_per_request': round(
+            statistics.mean(result['size'] for result in results)
+        ),
+    }
+
+
+def build_scenarios(per_page, deep_page=50):
+    """Сценарии для всех маршрутов blog/urls.py и pages/urls.py."""
+    feed = filter_published_posts(get_unfiltred_post())
+    post = feed.filter(comment_count__gt=0).first() or feed.first()
+    if post is None:
+        return []
+    author = post.author
+    comment = Comment.objects.filter(post=post, author=author).first() or (
+        Comment.objects.create(post=post, author=author, text='benchmark')
+    )
+    category = post.category
+    offset = deep_page * per_page
+    deep_post = next(iter(feed[offset:offset + 1]), None)
+    deep = f'?cursor={encode_cursor(deep_post)}' if deep_post else '?page=2'
+    index = reverse('blog:index')
+    detail = reverse('blog:post_detail', args=[post.pk])
+    comments = reverse('blog:post_comments', args=[post.pk])
+    category_url = reverse('blog:category_posts', args=[category.slug])
+    profile = reverse('blog:profile', args=[author.username])
+    new_post = {
+        'title': 'Benchmark',
+        'text': 'Benchmark post',
+        'pub_date': post.pub_date.strftime('%Y-%m-%dT%H:%M'),
+        'category': category.pk,
+    }
+    same_post = dict(
+        new_post, title=post.title, text=post.text,
+        is_published=post.is_published,
+        location=post.location_id or '',
+    )
+
+    def disposable_post():
+        disposable = Post.objects.create(
+            title='Benchmark', text='Benchmark post', author=author,
+            pub_date=post.pub_date, category=category,
+        )
+        return reverse('blog:delete_post', args=[disposable.pk])
+
+    def disposable_comment():
+        disposable = Comment.objects.create(
+            post=post, author=author, text='benchmark'
+        )
+        return reverse('blog:delete_comment', args=[post.pk, disposable.pk])
+
+    scenarios = [
+        Scenario('index', index),
+        Scenario('index_page_2', f'{index}?page=2'),
+        Scenario('index_deep', f'{index}{deep}'),
+        Scenario('index_auth', index, user=author),
+        Scenario('category', category_url),
+        Scenario('category_deep', f'{category_url}{deep}'),
+        Scenario('profile', profile),
+        Scenario('profile_own', profile, user=author),
+        Scenario('post_detail', detail),
+        Scenario('post_detail_auth', detail, user=author),
+        Scenario('post_comments', comments),
+        Scenario('post_comments_auth', comments, user=author),
+        Scenario(
+            'header_fragment', reverse('blog:header_fragment'), user=author
+        ),
+        Scenario(
+            'post_controls_fragment',
+            f"{reverse('blog:post_controls', args=[post.pk])}"
+            f'?author={author.pk}',
+            user=author
+        ),
+        Scenario(
+            'comment_form_fragment',
+            reverse('blog:comment_form', args=[post.pk]), user=author
+        ),
+        Scenario('feed_rss', reverse('blog:feed_rss')),
+        Scenario('feed_atom', reverse('blog:feed_atom')),
+        Scenario(
+            'category_feed_rss',
+            reverse('blog:category_feed_rss', args=[category.slug])
+        ),
+        Scenario(
+            'author_feed_rss',
+            reverse('blog:author_feed_rss', args=[author.username])
+        ),
+        Scenario(
+            'search', f"{reverse('blog:search')}?{urlencode({'q': 'текст'})}"
+        ),
+        Scenario('about', reverse('pages:about')),
+        Scenario('rules', reverse('pages:rules')),
+        Scenario('create_post_form', reverse('blog:create_post'), user=author),
+        Scenario(
+            'create_post', reverse('blog:create_post'),
+            method='POST', data=new_post, user=author
+        ),
+        Scenario(
+            'edit_post_form', reverse('blog:edit_post', args=[post.pk]),
+            user=author
+        ),
+        Scenario(
+            'edit_post', reverse('blog:edit_post', args=[post.pk]),
+            method='POST', data=same_post, user=author
+        ),
+        Scenario(
+            'delete_post_form', reverse('blog:delete_post', args=[post.pk]),
+            user=author
+        ),
+        Scenario(
+            'delete_post', reverse('blog:delete_post', args=[post.pk]),
+            method='POST', user=author, prepare=disposable_post
+        ),
+        Scenario(
+            'add_comment', reverse('blog:add_comment', args=[post.pk]),
+            method='POST', data={'text': 'Benchmark'}, user=author
+        ),
+        Scenario(
+            'edit_comment_form',
+            reverse('blog:edit_comment', args=[post.pk, comment.pk]),
+            user=author
+        ),
+        Scenario(
+            'edit_comment',
+            reverse('blog:edit_comment', args=[post.pk, comment.pk]),
+            method='POST', data={'text': 'Benchmark edit'}, user=author
+        ),
+        Scenario(
+            'delete_comment_form',
+            reverse('blog:delete_comment', args=[post.pk, comment.pk]),
+            user=author
+        ),
+        Scenario(
+            'delete_comment',
+            reverse('blog:delete_comment', args=[post.pk, comment.pk]),
+            method='POST', user=author, prepare=disposable_comment
+        ),
+        Scenario('edit_profile_form', reverse('blog:edit_profile'),
+                 user=author),
+    ]
+    return scenarios
+
+
+def measure_compression(body, encoding, level, repeat=20):
+    """Процессорное время сжатия тела страницы и сэкономленные байты."""
+    start = time.process_time()
+    for _ in range(repeat):
+        compressed = compress_bytes(body, encoding, level)
+    cpu_ms = (time.process_time() - start) * 1000 / repeat
+    saved = len(body) - len(compressed)
+    return {
+        'bytes': len(compressed),
+        'saved_share': round(saved / len(body), 3),
+        'cpu_ms': round(cpu_ms, 3),
+        'saved_kb_per_cpu_ms': round(saved / 1024 / cpu_ms, 1)
+        if cpu_ms else None,
+    }
+
+
+def run_compression(application, scenarios, levels, repeat=20):
+    results = {}
+    for scenario in scenarios:
+        environ = build_environ(
+            scenario, BenchmarkClient.for_user(scenario.user)
+        )
+        body = call_application(application, environ, keep_body=True)['body']
+        results[scenario.name] = {'path': scenario.path, 'bytes': len(body)}
+        for encoding, level in levels:
+            results[scenario.name][f'{encoding}-{level}'] = (
+                measure_compression(body, encoding, level, repeat)
+            )
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Вернуть сценарии, где p95 или RPS хуже базовой линии больше порога."""
+    regressions = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        changes = {
+            'p95_ms': result['p95_ms'] / base['p95_ms'] - 1,
+            'rps': 1 - result['rps'] / base['rps'],
+            'queries_per_request': (
+                result['queries_per_request'] - base['queries_per_request']
+            ),
+        }
+        extra_queries = max(0.5, base['queries_per_request'] * threshold)
+        if (changes['p95_ms'] > threshold or changes['rps'] > threshold
+                or changes['queries_per_request'] > extra_queries):
+            regressions[name] = {
+                metric: round(value, 3) for metric, value in changes.items()
+            }
+    return regressions
+
+
+def open_sqlite(path, options):
+    connection = sqlite3.connect(
+        path, timeout=options.get('timeout', 5), isolation_level=None,
+        check_same_thread=False,
+    )
+    configure_connection(connection, options.get('pragmas', {}))
+    return connection
+
+
+def add_comment(connection, transaction_mode, post_id, author_id):
+    """Транзакция как при добавлении комментария: чтение, затем запись."""
+    connection.execute(f'BEGIN {transaction_mode or ""}')
+    try:
+        connection.execute(
+            'SELECT comment_count FROM blog_post WHERE id = ?', (post_id,)
+        ).fetchone()
+        connection.execute(
+            'INSERT INTO blog_comment (text, post_id, author_id, created_at) '
+            "VALUES ('benchmark', ?, ?, datetime('now'))",
+            (post_id, author_id),
+        )
+        connection.execute(
+            'UPDATE blog_post SET comment_count = comment_count + 1 '
+            'WHERE id = ?', (post_id,)
+        )
+        connection.execute('COMMIT')
+    except sqlite3.OperationalError:
+        connection.execute('ROLLBACK')
+        raise
+
+
+def read_feed(connection):
+    return connection.execute(
+        'SELECT id, title FROM blog_post WHERE is_visible '
+        'ORDER BY pub_date DESC, id DESC LIMIT 10'
+    ).fetchall()
+
+
+def run_write_contention(path, options, writers=8, readers=4, duration=5,
+                         reuse_connections=True):
+    """Нагрузить копию базы конкурентными комментариями и чтением ленты.
+
+    Без reuse_connections каждая операция открывает новое соединение,
+    как при CONN_MAX_AGE = 0.
+    """
+    with open_sqlite(path, options) as connection:
+        post_id, author_id = connection.execute(
+            'SELECT id, author_id FROM blog_post ORDER BY id LIMIT 1'
+        ).fetchone()
+    operations = {
+        'write': lambda connection: add_comment(
+            connection, options.get('transaction_mode'), post_id, author_id
+        ),
+        'read': read_feed,
+    }
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {'write': [], 'read': [], 'errors': 0}
+
+    def worker(name):
+        connection = open_sqlite(path, options)
+        try:
+            while not stop.is_set():
+                if not reuse_connections:
+                    connection.close()
+                    connection = open_sqlite(path, options)
+                start = time.perf_counter()
+                try:
+                    operations[name](connection)
+                except sqlite3.OperationalError:
+                    with lock:
+                        stats['errors'] += 1
+                    continue
+                with lock:
+                    stats[name].append((time.perf_counter() - start) * 1000)
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=worker, args=('write',))
+        for _ in range(writers)
+    ] + [
+        threading.Thread(target=worker, args=('read',))
+        for _ in range(readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    latencies = stats['write'] or [0]
+    return {
+        'writers': writers,
+        'readers': readers,
+        'commits_per_s': round(len(stats['write']) / duration, 2),
+        'reads_per_s': round(len(stats['read']) / duration, 2),
+        'lock_errors': stats['errors'],
+        'p95_commit_ms': round(percentile(latencies, 0.95), 3),
+    }
@@ -0,0 +1,259 @@
+"""Потоковые выгрузка и загрузка данных блога.
+
+Формат записей тот же, что у dumpdata/loaddata: ``{"model", "pk",
+"fields"}``; поддерживаются JSON-массив и NDJSON (по записи в строке).
+В памяти одновременно держится не больше одной пачки объектов.
+"""
+import gzip
+import json
+import sys
+from datetime import datetime
+from functools import partial
+
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.serializers.python import Deserializer
+from django.core.serializers.python import Serializer as PythonSerializer
+from django.db import connections, transaction
+from django.utils import timezone
+
+from . import page_cache
+from .models import Category, Comment, Location, Post, User
+
+MODELS = (User, Category, Location, Post, Comment)
+CHUNK_SIZE = 64 * 1024
+
+
+def open_dump(path, mode):
+    """Файл дампа; ``-`` — stdin/stdout, ``.gz`` сжимается на лету."""
+    if path == '-':
+        return sys.stdin if mode == 'r' else sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, f'{mode}t', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def iter_json_array(stream, buffer='', chunk_size=CHUNK_SIZE):
+    """Элементы JSON-массива по одному, без чтения документа целиком."""
+    decoder = json.JSONDecoder()
+    buffer = (buffer + stream.read(chunk_size)).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('Ожидался JSON-массив')
+    position = 1
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if buffer[position:position + 1] == ']':
+            return
+        try:
+            record, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                raise
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield record
+
+
+def iter_ndjson(stream, line=''):
+    line += stream.readline()
+    while line:
+        if line.strip():
+            yield json.loads(line)
+        line = stream.readline()
+
+
+def read_records(stream):
+    """Записи из JSON-массива или NDJSON, формат определяется по началу."""
+    head = stream.read(1)
+    while head.isspace():
+        head = stream.read(1)
+    if head == '[':
+        return iter_json_array(stream, head)
+    return iter_ndjson(stream, head)
+
+
+class DumpEncoder(DjangoJSONEncoder):
+    """Даты без округления до миллисекунд: по ним строятся курсоры."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class StreamSerializer(PythonSerializer):
+    """Сериализатор, который отдаёт объект сразу, а не копит список."""
+
+    def __init__(self, write):
+        super().__init__()
+        self.write = write
+
+    def end_object(self, obj):
+        self.write(self.get_dump_object(obj))
+        self._current = None
+
+
+def export_data(stream, array=False, chunk_size=2000, using='default'):
+    """Выгрузить модели блога, читая каждую таблицу iterator'ом."""
+    exported = 0
+
+    def write(record):
+        nonlocal exported
+        if array:
+            stream.write(',\n' if exported else '[\n')
+        stream.write(json.dumps(
+            record, cls=DumpEncoder, ensure_ascii=False
+        ))
+        if not array:
+            stream.write('\n')
+        exported += 1
+
+    serializer = StreamSerializer(write)
+    for model in MODELS:
+        serializer.serialize(
+            model._default_manager.using(using).order_by('pk').iterator(
+                chunk_size=chunk_size
+            ),
+            fields=[
+                field.name for field in model._meta.local_fields
+                if not field.primary_key
+            ],
+        )
+    if array:
+        stream.write('\n]\n' if exported else '[]\n')
+    return exported
+
+
+def bulk_create_with_dates(queryset, objects, batch_size):
+    """bulk_create с датами из дампа в полях auto_now/auto_now_add.
+
+    bulk_create заменяет такие даты текущим временем, поэтому они
+    записываются вторым запросом bulk_update, который их не трогает.
+    """
+    fields = [
+        field for field in queryset.model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    now = timezone.now()
+    dates = [
+        [getattr(obj, field.attname) or now for field in fields]
+        for obj in objects
+    ]
+    queryset.bulk_create(objects, batch_size=batch_size)
+    if not fields:
+        return
+    for obj, values in zip(objects, dates):
+        for field, value in zip(fields, values):
+            setattr(obj, field.attname, value)
+    queryset.bulk_update(
+        objects, [field.name for field in fields], batch_size=batch_size
+    )
+
+
+def batch_scopes(objects):
+    """Области кэша страниц, которые затронула пачка объектов."""
+    scopes = set()
+    for obj in objects:
+        if isinstance(obj, Post):
+            scopes.update(['feed', *page_cache.post_scopes(obj)])
+        elif isinstance(obj, Comment):
+            scopes.add(f'post:{obj.post_id}')
+        elif isinstance(obj, Category):
+            scopes.update(['feed', f'category:{obj.pk}'])
+        elif isinstance(obj, Location):
+            scopes.add(f'location:{obj.pk}')
+        elif isinstance(obj, User):
+            scopes.add(f'user:{obj.pk}')
+    return scopes
+
+
+class Importer:
+    """Пакетная загрузка записей через bulk_create без сигналов.
+
+    Сигналы моделей при bulk_create не отправляются; производные данные
+    (видимость, счётчики комментариев, поисковый индекс) пересчитываются
+    один раз после загрузки.
+    """
+
+    labels = {model._meta.label_lower: model for model in MODELS}
+
+    def __init__(self, batch_size=2000, using='default'):
+        self.batch_size = batch_size
+        self.using = using
+        self.model = None
+        self.objects = []
+        self.m2m = []
+        self.loaded = 0
+        self.skipped = 0
+
+    def load(self, records):
+        with transaction.atomic(using=self.using):
+            for obj in Deserializer(
+                self.filter_models(records), using=self.using,
+                ignorenonexistent=True,
+            ):
+                self.add(obj)
+            self.flush()
+            self.reset_sequences()
+        return self.loaded
+
+    def filter_models(self, records):
+        for record in records:
+            if record.get('model', '').lower() in self.labels:
+                yield record
+            else:
+                self.skipped += 1
+
+    def add(self, deserialized):
+        obj = deserialized.object
+        if type(obj) is not self.model or len(self.objects) >= (
+            self.batch_size
+        ):
+            self.flush()
+            self.model = type(obj)
+        self.objects.append(obj)
+        for name, values in (deserialized.m2m_data or {}).items():
+            self.m2m.append((obj, obj._meta.get_field(name), values))
+
+    def flush(self):
+        if not self.objects:
+            return
+        bulk_create_with_dates(
+            self.model._default_manager.using(self.using), self.objects,
+            self.batch_size
+        )
+        self.flush_m2m()
+        transaction.on_commit(
+            partial(page_cache.invalidate, *batch_scopes(self.objects)),
+            using=self.using,
+        )
+        self.loaded += len(self.objects)
+        self.objects = []
+
+    def flush_m2m(self):
+        rows = {}
+        for obj, field, values in self.m2m:
+            through = field.remote_field.through
+            rows.setdefault(through, []).extend(
+                through(**{
+                    f'{field.m2m_field_name()}_id': obj.pk,
+                    f'{field.m2m_reverse_field_name()}_id': value,
+                })
+                for value in values
+            )
+        for through, objects in rows.items():
+            through._default_manager.using(self.using).bulk_create(
+                objects, batch_size=self.batch_size
+            )
+        self.m2m = []
+
+    def reset_sequences(self):
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(no_style(), MODELS)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
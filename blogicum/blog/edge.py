@@ -0,0 +1,75 @@
+"""Персональные фрагменты поверх общего для всех тела страницы.
+
+Тело страницы кэшируется одно для всех пользователей, а на месте
+шапки с кнопками пользователя, кнопок автора и формы комментария
+в нём стоят SSI-метки. Их подставляет EdgeIncludeMiddleware
+или фронтовой nginx с ``ssi on``, если EDGE_INCLUDES_IN_PROCESS
+выключен.
+"""
+import copy
+import hashlib
+import re
+
+from django.conf import settings
+from django.http import QueryDict
+from django.urls import Resolver404, resolve
+from django.utils.http import quote_etag
+
+INCLUDE_RE = re.compile(rb'<!--# include virtual="([^"]+)" -->')
+
+
+def include_tag(url):
+    return f'<!--# include virtual="{url}" -->'
+
+
+def personalize_etag(request, etag):
+    """Персональный ETag ответа с подставленными фрагментами.
+
+    CSRF-cookie берётся как есть, без get_token: иначе ответ считался бы
+    содержащим токен и не сжимался (см. blogicum.compression).
+    """
+    if not etag or not request.user.is_authenticated:
+        return etag
+    csrf_cookie = request.META.get('CSRF_COOKIE', '')
+    state = f'{etag}:{request.user.pk}:{csrf_cookie}'
+    return quote_etag(hashlib.md5(state.encode()).hexdigest())
+
+
+def render_include(request, url):
+    """Отрисовать фрагмент в рамках исходного запроса, без HTTP."""
+    path, _, query = url.partition('?')
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return b''
+    subrequest = copy.copy(request)
+    subrequest.method = 'GET'
+    subrequest.path = subrequest.path_info = path
+    subrequest.GET = QueryDict(query)
+    subrequest.resolver_match = match
+    response = match.func(subrequest, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response.content if response.status_code == 200 else b''
+
+
+class EdgeIncludeMiddleware:
+    """Подставляет персональные фрагменты в HTML-ответ."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.streaming
+                or 'text/html' not in response.get('Content-Type', '')
+                or not INCLUDE_RE.search(response.content)):
+            return response
+        if settings.EDGE_INCLUDES_IN_PROCESS:
+            response.content = INCLUDE_RE.sub(
+                lambda match: render_include(request, match[1].decode()),
+                response.content,
+            )
+        if response.has_header('ETag'):
+            response['ETag'] = personalize_etag(request, response['ETag'])
+        return response
@@ -0,0 +1,134 @@
+import hashlib
+
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import parse_http_date_safe, quote_etag
+from django.utils.text import Truncator
+
+from . import page_cache
+from .models import Category, User
+from .utils import filter_published_posts, get_unfiltred_post
+
+FEED_SIZE = 20
+DESCRIPTION_WORDS = 60
+
+
+class CachedFeed(Feed):
+    """Лента с кэшем готового XML и ответом 304 по ETag.
+
+    Кэш зависит от области feed, которую сбрасывает любое изменение
+    поста или категории и публикация отложенных постов.
+    """
+
+    cache_scopes = ('feed',)
+    query_budget = 4
+
+    def __call__(self, request, *args, **kwargs):
+        response = page_cache.get_page(request)
+        if response is None:
+            snapshot = page_cache.snapshot_versions(self.cache_scopes)
+            response = super().__call__(request, *args, **kwargs)
+            response['ETag'] = quote_etag(
+                hashlib.md5(response.content).hexdigest()
+            )
+            page_cache.set_page(
+                request, response, self.cache_scopes, snapshot
+            )
+        return get_conditional_response(
+            request,
+            etag=response['ETag'],
+            last_modified=parse_http_date_safe(response.get('Last-Modified')),
+            response=response,
+        )
+
+    def get_posts(self, obj):
+        return filter_published_posts(get_unfiltred_post())
+
+    def items(self, obj):
+        return self.get_posts(obj)[:FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.text).words(DESCRIPTION_WORDS)
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return (item.category.title,) if item.category else ()
+
+
+class LatestPostsFeed(CachedFeed):
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума'
+
+    def link(self):
+        return reverse('blog:index')
+
+
+class CategoryPostsFeed(CachedFeed):
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(category=obj)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+
+class AuthorPostsFeed(CachedFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(author=obj)
+
+    def title(self, obj):
+        return f'Блогикум: @{obj.username}'
+
+    def description(self, obj):
+        return f'Публикации пользователя {obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.username])
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
@@ -1,5 +1,6 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.models import Permission
 from django.utils.timezone import localtime, now
 
 from .models import Comment, Post, User
@@ -35,6 +36,12 @@ class PostForm(forms.ModelForm):
 
 class UserUpdateForm(forms.ModelForm):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['user_permissions'].queryset = (
+            Permission.objects.select_related('content_type')
+        )
+
     class Meta:
         model = User
         exclude = ('password',)
@@ -0,0 +1,37 @@
+import hashlib
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+CARD_TEMPLATE = 'includes/post_card.html'
+CARD_TIMEOUT = 60 * 60 * 24
+
+
+def card_key(post):
+    """Ключ карточки меняется вместе со всем, что в ней отображается."""
+    category, location = post.category, post.location
+    version = repr((
+        post.updated_at.timestamp(),
+        post.comment_count,
+        post.author.username,
+        category and (category.is_published, category.slug, category.title),
+        location and (location.is_published, location.name),
+        get_language(),
+    ))
+    digest = hashlib.md5(version.encode()).hexdigest()
+    return f'blog:card:{post.pk}:{digest}'
+
+
+def render_cards(posts):
+    keys = {card_key(post): post for post in posts}
+    cards = cache.get_many(keys)
+    missing = {
+        key: render_to_string(CARD_TEMPLATE, {'post': post})
+        for key, post in keys.items() if key not in cards
+    }
+    if missing:
+        cache.set_many(missing, CARD_TIMEOUT)
+        cards.update(missing)
+    return [mark_safe(cards[key]) for key in keys]
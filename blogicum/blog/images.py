@@ -0,0 +1,126 @@
+import atexit
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.db import close_old_connections
+from PIL import Image, ImageOps
+
+VARIANTS_DIR = 'variants'
+VARIANT_WIDTHS = {
+    'card': 640,
+    'detail': 960,
+    'retina': 1280,
+}
+SIZES = {
+    'card': '(max-width: 640px) 100vw, 640px',
+    'detail': '(max-width: 960px) 100vw, 960px',
+}
+WEBP = 'webp'
+QUALITY = 82
+
+_executor = None
+
+logger = logging.getLogger(__name__)
+
+
+def fallback_extension(name):
+    extension = PurePosixPath(name).suffix.lower().lstrip('.')
+    return extension if extension in ('jpg', 'jpeg', 'png') else 'jpg'
+
+
+def variant_name(name, width, extension):
+    path = PurePosixPath(name)
+    return str(PurePosixPath(
+        VARIANTS_DIR, path.parent, f'{path.stem}.{width}w.{extension}'
+    ))
+
+
+def variant_names(name):
+    for width in sorted(set(VARIANT_WIDTHS.values())):
+        for extension in (fallback_extension(name), WEBP):
+            yield width, extension, variant_name(name, width, extension)
+
+
+def render_variants(source, targets):
+    """Нарезать варианты изображения; выполняется в процессе пула.
+
+    Возвращает ширину наибольшего варианта или 0, если изображение
+    уже не шире самого маленького из них.
+    """
+    rendered = 0
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        for width, extension, path in targets:
+            if image.width <= width:
+                continue
+            rendered = max(rendered, width)
+            variant = image.resize(
+                (width, round(image.height * width / image.width)),
+                Image.Resampling.LANCZOS
+            )
+            if extension in ('jpg', 'jpeg') and variant.mode != 'RGB':
+                variant = variant.convert('RGB')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f'{path}.tmp'
+            variant.save(
+                temporary,
+                'JPEG' if extension == 'jpg' else extension.upper(),
+                quality=QUALITY
+            )
+            os.replace(temporary, path)
+    return rendered
+
+
+def get_executor():
+    global _executor
+    if _executor is None and settings.IMAGE_VARIANT_WORKERS:
+        _executor = ProcessPoolExecutor(settings.IMAGE_VARIANT_WORKERS)
+        atexit.register(_executor.shutdown, wait=False)
+    return _executor
+
+
+def finish_variants(callback, future):
+    """Сохранить результат пула; выполняется в служебном потоке пула."""
+    error = future.exception()
+    if error is not None:
+        logger.error(
+            'Не удалось нарезать варианты изображения', exc_info=error
+        )
+        return
+    close_old_connections()
+    try:
+        callback(future.result())
+    finally:
+        close_old_connections()
+
+
+def generate_variants(file, callback):
+    """Нарезать варианты и передать в callback ширину наибольшего."""
+    targets = [
+        (width, extension, file.storage.path(name))
+        for width, extension, name in variant_names(file.name)
+    ]
+    executor = get_executor()
+    if executor is None:
+        callback(render_variants(file.path, targets))
+    else:
+        future = executor.submit(render_variants, file.path, targets)
+        future.add_done_callback(partial(finish_variants, callback))
+
+
+def delete_variants(name, storage):
+    for _, _, variant in variant_names(name):
+        storage.delete(variant)
+
+
+def get_srcset(file, extension, max_width):
+    """Атрибут srcset из нарезанных вариантов без обращений к хранилищу."""
+    return ', '.join(
+        f'{file.storage.url(name)} {width}w'
+        for width, variant_extension, name in variant_names(file.name)
+        if variant_extension == extension and width <= max_width
+    )
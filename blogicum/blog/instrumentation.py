@@ -0,0 +1,164 @@
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+BUCKETS_COUNT = (1, 2, 3, 5, 8, 13, 20, 30, 50, 100)
+METRICS = {
+    'total': BUCKETS_MS,
+    'db': BUCKETS_MS,
+    'tpl': BUCKETS_MS,
+    'queries': BUCKETS_COUNT,
+}
+REPEATED_QUERY_LIMIT = 3
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(limit):
+    """Задать бюджет запросов к БД для view-функции."""
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self):
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'buckets': dict(zip(bounds, self.counts)),
+        }
+
+
+_histograms = defaultdict(dict)
+_lock = threading.Lock()
+
+
+def record(url_name, metrics):
+    with _lock:
+        histograms = _histograms[url_name]
+        for name, buckets in METRICS.items():
+            histograms.setdefault(name, Histogram(buckets)).add(
+                getattr(metrics, name)
+            )
+
+
+def snapshot():
+    with _lock:
+        return {
+            url_name: {name: hist.as_dict() for name, hist in metrics.items()}
+            for url_name, metrics in sorted(_histograms.items())
+        }
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.queries = 0
+        self.statements = Counter()
+        self.db = 0.0
+        self.tpl = 0.0
+        self.total = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += (time.perf_counter() - start) * 1000
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def budget_violations(self, budget):
+        violations = []
+        if budget is not None and self.queries > budget:
+            violations.append(
+                f'выполнено {self.queries} запросов при бюджете {budget}'
+            )
+        for sql, count in self.statements.items():
+            if count >= REPEATED_QUERY_LIMIT:
+                violations.append(f'запрос повторён {count} раз (N+1): {sql}')
+        return violations
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.db:.1f};desc="{self.queries} queries", '
+            f'tpl;dur={self.tpl:.1f}, total;dur={self.total:.1f}'
+        )
+
+
+class RequestMetricsMiddleware:
+    """Считает запросы к БД, время БД, шаблонов и ответа для каждого view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.metrics = RequestMetrics()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+        metrics.total = (time.perf_counter() - start) * 1000
+        match = request.resolver_match
+        record(match.view_name if match else '<unresolved>', metrics)
+        if match and settings.QUERY_BUDGET_MODE and (
+            random.random() < settings.QUERY_BUDGET_SAMPLE_RATE
+        ):
+            self.check_budget(match, metrics)
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = metrics.server_timing()
+        return response
+
+    def check_budget(self, match, metrics):
+        view = getattr(match.func, 'view_class', match.func)
+        violations = metrics.budget_violations(
+            getattr(view, 'query_budget', None)
+        )
+        if not violations:
+            return
+        message = f'{match.view_name}: ' + '; '.join(violations)
+        if settings.QUERY_BUDGET_MODE == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+
+        def stop_timer(response):
+            request.metrics.tpl += (time.perf_counter() - start) * 1000
+
+        response.add_post_render_callback(stop_timer)
+        return response
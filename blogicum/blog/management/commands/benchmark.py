@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from blog.benchmarks import (BENCHMARK_HOST, build_scenarios, compare,
+                             run_scenario)
+from blog.views import POST_PER_PAGE
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный прогон всех маршрутов через WSGI-приложение '
+            'blogicum.wsgi внутри процесса; результат в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--deep-page', type=int, default=50)
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Запустить только указанные сценарии.'
+        )
+        parser.add_argument('--output', type=Path)
+        parser.add_argument(
+            '--baseline', type=Path,
+            help='JSON прошлого прогона для сравнения.'
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=0.1,
+            help='Допустимое ухудшение p95 и RPS относительно базовой линии.'
+        )
+        parser.add_argument(
+            '--debug', action='store_true',
+            help='Не отключать DEBUG на время прогона.'
+        )
+        parser.add_argument(
+            '--no-page-cache', action='store_true',
+            help='Отключить кэш страниц, чтобы мерить отрисовку, а не кэш.'
+        )
+
+    def handle(self, *args, **options):
+        overrides = {'ALLOWED_HOSTS': [BENCHMARK_HOST]}
+        if not options['debug']:
+            overrides['DEBUG'] = False
+        if options['no_page_cache']:
+            overrides['PAGE_CACHE_TIMEOUT'] = 0
+        with override_settings(**overrides):
+            from blogicum.wsgi import application
+
+            scenarios = build_scenarios(POST_PER_PAGE, options['deep_page'])
+            if not scenarios:
+                raise CommandError(
+                    'Нет опубликованных постов: сначала выполните '
+                    'generate_dataset.'
+                )
+            if options['scenarios']:
+                scenarios = [
+                    scenario for scenario in scenarios
+                    if scenario.name in options['scenarios']
+                ]
+            results = {}
+            for scenario in scenarios:
+                results[scenario.name] = run_scenario(
+                    application,
+                    scenario,
+                    options['requests'],
+                    options['concurrency'],
+                    options['warmup'],
+                )
+                self.stderr.write(
+                    f"{scenario.name}: p95 {results[scenario.name]['p95_ms']}"
+                    f" мс, {results[scenario.name]['rps']} RPS"
+                )
+        report = json.dumps(results, ensure_ascii=False, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(report, encoding='utf-8')
+        self.stdout.write(report)
+        if options['baseline']:
+            baseline = json.loads(
+                Path(options['baseline']).read_text(encoding='utf-8')
+            )
+            regressions = compare(results, baseline, options['threshold'])
+            if regressions:
+                raise CommandError(
+                    'Регрессия относительно базовой линии:\n'
+                    + json.dumps(regressions, ensure_ascii=False, indent=2)
+                )
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from blog.benchmarks import BENCHMARK_HOST, build_scenarios, run_compression
+from blog.views import POST_PER_PAGE
+
+PAGES = (
+    'index', 'index_page_2', 'index_deep', 'category', 'profile',
+    'post_detail', 'feed_rss',
+)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает процессорное время gzip и brotli разных уровней '
+            'с экономией байтов на страницах блога; результат в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--gzip-levels', type=int, nargs='+', default=[1, 6, 9]
+        )
+        parser.add_argument(
+            '--brotli-levels', type=int, nargs='+', default=[1, 4, 11]
+        )
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--output', type=Path)
+
+    def handle(self, *args, **options):
+        levels = [('gzip', level) for level in options['gzip_levels']] + [
+            ('br', level) for level in options['brotli_levels']
+        ]
+        with override_settings(DEBUG=False, ALLOWED_HOSTS=[BENCHMARK_HOST]):
+            from blogicum.wsgi import application
+
+            scenarios = [
+                scenario for scenario in build_scenarios(POST_PER_PAGE)
+                if scenario.name in PAGES
+            ]
+            if not scenarios:
+                raise CommandError(
+                    'Нет опубликованных постов: сначала выполните '
+                    'generate_dataset.'
+                )
+            results = run_compression(
+                application, scenarios, levels, options['repeat']
+            )
+        for name, result in results.items():
+            self.stderr.write(f"{name}: {result['bytes']} байт, " + ', '.join(
+                f"{key} −{value['saved_share']:.0%} за {value['cpu_ms']} мс"
+                for key, value in result.items() if isinstance(value, dict)
+            ))
+        report = json.dumps(results, ensure_ascii=False, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(report, encoding='utf-8')
+        self.stdout.write(report)
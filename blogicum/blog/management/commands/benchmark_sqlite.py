@@ -0,0 +1,56 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from blog.benchmarks import SQLITE_DEFAULTS, run_write_contention
+from blog.replication import copy_database
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает конкурентную запись в SQLite с настройками по '
+            'умолчанию и с настройками из DATABASES на копии базы.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=5)
+        parser.add_argument('--output', type=Path)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Бенчмарк рассчитан только на SQLite.')
+        connection_options = connection.get_connection_params()
+        tuned = {
+            'timeout': connection_options.get('timeout', 5),
+            'transaction_mode': getattr(connection, 'transaction_mode', None),
+            'pragmas': getattr(connection, 'pragmas', {}),
+        }
+        profiles = {
+            'defaults': (SQLITE_DEFAULTS, False),
+            'tuned': (tuned, True),
+        }
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name, (profile, reuse) in profiles.items():
+                path = str(Path(directory) / f'{name}.sqlite3')
+                copy_database(connection, path)
+                results[name] = run_write_contention(
+                    path, profile,
+                    writers=options['writers'],
+                    readers=options['readers'],
+                    duration=options['duration'],
+                    reuse_connections=reuse,
+                )
+                self.stderr.write(
+                    f"{name}: {results[name]['commits_per_s']} записей/с, "
+                    f"{results[name]['lock_errors']} блокировок"
+                )
+        report = json.dumps(results, ensure_ascii=False, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(report, encoding='utf-8')
+        self.stdout.write(report)
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from blog import dumps
+
+
+class Command(BaseCommand):
+    help = ('Потоково выгружает пользователей, категории, местоположения, '
+            'публикации и комментарии в NDJSON или JSON-массив.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Файл дампа, «-» — stdout; к .gz применяется gzip.'
+        )
+        parser.add_argument(
+            '--format', dest='dump_format', choices=('ndjson', 'json'),
+            default='ndjson'
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, path, dump_format, chunk_size, database,
+               **options):
+        stream = dumps.open_dump(path, 'w')
+        try:
+            exported = dumps.export_data(
+                stream, array=dump_format == 'json', chunk_size=chunk_size,
+                using=database,
+            )
+        finally:
+            if path != '-':
+                stream.close()
+        self.stderr.write(f'Выгружено объектов: {exported}')
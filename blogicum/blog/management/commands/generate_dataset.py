@@ -0,0 +1,165 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+from django.utils import timezone
+from faker import Faker
+
+from blog.models import Category, Comment, Location, Post, User
+
+DEFAULT_PASSWORD = 'benchmark-password'
+
+
+def zipf_index(size, exponent, rng):
+    """Индекс 0..size-1 с распределением, близким к закону Ципфа.
+
+    Используется обратная функция распределения непрерывного степенного
+    закона, поэтому не нужно держать в памяти таблицу весов.
+    """
+    u = rng.random()
+    if exponent == 1:
+        rank = size ** u
+    else:
+        power = 1 - exponent
+        rank = ((size ** power - 1) * u + 1) ** (1 / power)
+    return min(int(rank) - 1, size - 1)
+
+
+class Command(BaseCommand):
+    help = ('Генерирует синтетические данные для нагрузочного тестирования '
+            'пакетными bulk_create с ограниченным расходом памяти.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--locations', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Показатель степени для распределения авторов, категорий '
+                 'и комментариев по постам.'
+        )
+        parser.add_argument('--scheduled-share', type=float, default=0.05)
+        parser.add_argument('--unpublished-share', type=float, default=0.05)
+        parser.add_argument('--days', type=int, default=3 * 365)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument(
+            '--skip-rebuild', action='store_true',
+            help='Не пересчитывать счётчики комментариев и поисковый индекс.'
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.rng = random.Random(options['seed'])
+        self.fake = Faker('ru_RU')
+        self.fake.seed_instance(options['seed'])
+        self.now = timezone.now()
+
+        users = self.create_users()
+        if not users:
+            self.stderr.write('Для публикаций нужен хотя бы один автор.')
+            return
+        categories = self.create(
+            Category, options['categories'], self.build_category
+        )
+        locations = self.create(
+            Location, options['locations'], self.build_location
+        )
+        posts = self.create(
+            Post, options['posts'],
+            lambda number: self.build_post(users, categories, locations)
+        )
+        self.create(
+            Comment, options['comments'] if posts else 0,
+            lambda number: self.build_comment(users, posts)
+        )
+        call_command('publish_scheduled', rebuild=True, stdout=self.stdout)
+        if not options['skip_rebuild']:
+            call_command('rebuild_comment_counts', stdout=self.stdout)
+            call_command('rebuild_search_index', stdout=self.stdout)
+
+    def create(self, model, total, build):
+        """Создать total объектов пачками и вернуть диапазон их id."""
+        first_id = model.objects.aggregate(last=Max('pk'))['last'] or 0
+        for start in range(0, total, self.options['batch_size']):
+            size = min(self.options['batch_size'], total - start)
+            model.objects.bulk_create(
+                [build(start + number) for number in range(size)],
+                batch_size=self.options['batch_size'],
+            )
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: {start + size}/{total}'
+            )
+        ids = model.objects.filter(pk__gt=first_id).aggregate(
+            first=Min('pk'), last=Max('pk')
+        )
+        if ids['first'] is None:
+            return range(0)
+        return range(ids['first'], ids['last'] + 1)
+
+    def pick(self, ids):
+        return ids[zipf_index(len(ids), self.options['zipf'], self.rng)]
+
+    def create_users(self):
+        password = make_password(DEFAULT_PASSWORD)
+        suffix = self.rng.randrange(10 ** 6)
+        return self.create(User, self.options['users'], lambda number: User(
+            username=f'{self.fake.user_name()}_{suffix}_{number}',
+            email=self.fake.email(),
+            first_name=self.fake.first_name(),
+            last_name=self.fake.last_name(),
+            password=password,
+        ))
+
+    def build_category(self, number):
+        return Category(
+            title=self.fake.word().capitalize(),
+            description=self.fake.sentence(),
+            slug=f'{self.fake.slug()}-{self.rng.randrange(10 ** 6)}-{number}',
+            is_published=self.rng.random() > 0.1,
+        )
+
+    def build_location(self, number):
+        return Location(
+            name=self.fake.city(),
+            is_published=self.rng.random() > 0.1,
+        )
+
+    def build_post(self, users, categories, locations):
+        roll = self.rng.random()
+        scheduled_share = self.options['scheduled_share']
+        if roll < scheduled_share:
+            pub_date = self.now + timedelta(
+                minutes=self.rng.randrange(1, 60 * 24 * 30)
+            )
+        else:
+            pub_date = self.now - timedelta(
+                minutes=self.rng.randrange(60 * 24 * self.options['days'])
+            )
+        return Post(
+            title=self.fake.sentence(nb_words=5)[:256],
+            text=self.fake.paragraph(nb_sentences=8),
+            pub_date=pub_date,
+            is_published=(
+                roll >= scheduled_share + self.options['unpublished_share']
+                or roll < scheduled_share
+            ),
+            author_id=self.pick(users),
+            category_id=self.pick(categories) if categories else None,
+            location_id=(
+                self.rng.choice(locations)
+                if locations and self.rng.random() > 0.3 else None
+            ),
+        )
+
+    def build_comment(self, users, posts):
+        return Comment(
+            text=self.fake.sentence(nb_words=12),
+            post_id=self.pick(posts),
+            author_id=self.pick(users),
+        )
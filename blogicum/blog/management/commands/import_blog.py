@@ -0,0 +1,46 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+
+from blog import dumps, search
+
+
+class Command(BaseCommand):
+    help = ('Потоково загружает данные блога из NDJSON или JSON-массива '
+            'в пустую базу пачками bulk_create без сигналов на каждый '
+            'объект.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Файл дампа, «-» — stdin; .gz распаковывается на лету.'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--database', default='default')
+        parser.add_argument(
+            '--skip-rebuild', action='store_true',
+            help='Не пересчитывать видимость, счётчики комментариев '
+                 'и поисковый индекс.'
+        )
+
+    def handle(self, *args, path, batch_size, database, skip_rebuild,
+               **options):
+        importer = dumps.Importer(batch_size, using=database)
+        stream = dumps.open_dump(path, 'r')
+        try:
+            importer.load(dumps.read_records(stream))
+        except (ValueError, DeserializationError) as error:
+            raise CommandError(f'Не удалось загрузить дамп: {error}')
+        finally:
+            if path != '-':
+                stream.close()
+        self.stdout.write(
+            f'Загружено объектов: {importer.loaded}, '
+            f'пропущено записей других моделей: {importer.skipped}'
+        )
+        if skip_rebuild:
+            return
+        call_command('publish_scheduled', rebuild=True, stdout=self.stdout)
+        call_command('rebuild_comment_counts', stdout=self.stdout)
+        if search.is_available():
+            call_command('rebuild_search_index', stdout=self.stdout)
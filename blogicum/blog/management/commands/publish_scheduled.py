@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog import visibility
+
+
+class Command(BaseCommand):
+    help = ('Делает видимыми отложенные публикации, время которых '
+            'наступило, и сбрасывает кэш затронутых страниц.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять публикации каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=30)
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Пересчитать видимость всех постов, а не только отложенных.'
+        )
+
+    def handle(self, *args, batch_size, loop, interval, rebuild, **options):
+        if rebuild:
+            self.stdout.write(
+                f'Изменена видимость постов: {visibility.rebuild_visibility()}'
+            )
+        while True:
+            published = visibility.publish_scheduled(batch_size)
+            if published:
+                self.stdout.write(f'Опубликовано постов: {published}')
+            if not loop:
+                break
+            time.sleep(interval)
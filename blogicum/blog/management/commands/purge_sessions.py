@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.sessions import purge_expired_sessions
+
+
+class Command(BaseCommand):
+    help = ('Удаляет истёкшие сессии пачками, не блокируя таблицу '
+            'сессий надолго.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Пауза между пачками в секундах.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а чистить сессии каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=60 * 60)
+
+    def handle(self, *args, batch_size, pause, loop, interval, **options):
+        while True:
+            deleted = purge_expired_sessions(batch_size, pause)
+            if deleted:
+                self.stdout.write(f'Удалено сессий: {deleted}')
+            if not loop:
+                break
+            time.sleep(interval)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count пакетами по диапазонам id.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, batch_size, **options):
+        counts = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        start = 0
+        updated = 0
+        while True:
+            ids = Post.objects.filter(pk__gt=start).order_by(
+                'pk'
+            ).values_list('pk', flat=True)[:batch_size]
+            ids = list(ids)
+            if not ids:
+                break
+            with transaction.atomic():
+                updated += Post.objects.filter(
+                    pk__gte=ids[0], pk__lte=ids[-1]
+                ).update(comment_count=Coalesce(Subquery(counts), 0))
+            start = ids[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано публикаций: {updated}')
+        )
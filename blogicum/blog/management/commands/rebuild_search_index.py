@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog import search
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс FTS5 по публикациям.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, batch_size, **options):
+        if not search.is_available():
+            raise CommandError(
+                'Полнотекстовый поиск доступен только в SQLite.'
+            )
+        with transaction.atomic():
+            indexed = search.rebuild(Post.objects.all(), batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано публикаций: {indexed}')
+        )
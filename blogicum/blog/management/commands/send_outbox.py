@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пакетами по одному соединению.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, batch_size, loop, interval, **options):
+        while True:
+            try:
+                sent = drain_outbox(batch_size)
+            except OSError as error:
+                self.stderr.write(f'Почтовый сервер недоступен: {error}')
+                sent = 0
+            if sent:
+                self.stdout.write(f'Отправлено писем: {sent}')
+            if not loop:
+                break
+            time.sleep(interval)
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.replication import sync_replicas
+
+
+class Command(BaseCommand):
+    help = ('Копирует основную SQLite-базу в файлы реплик: локальная '
+            'замена репликации для проверки маршрутизации чтений.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а копировать базу каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=2)
+
+    def handle(self, *args, loop, interval, **options):
+        while True:
+            synced = sync_replicas()
+            self.stdout.write(f'Обновлено реплик: {synced}')
+            if not loop:
+                break
+            time.sleep(interval)
@@ -0,0 +1,54 @@
+import re
+
+import snowballstemmer
+from django.db import migrations
+
+WORD_RE = re.compile(r'\w+')
+
+
+def normalize(stemmer, text):
+    return ' '.join(stemmer.stemWords(WORD_RE.findall(text.lower())))
+
+
+def create_search_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    stemmer = snowballstemmer.stemmer('russian')
+    Post = apps.get_model('blog', 'Post')
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_search '
+            'USING fts5(title, text, tokenize="unicode61")'
+        )
+        cursor.execute('DELETE FROM blog_post_search')
+        rows = Post.objects.using(connection.alias).values_list(
+            'pk', 'title', 'text'
+        )
+        cursor.executemany(
+            'INSERT INTO blog_post_search (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            (
+                (pk, normalize(stemmer, title), normalize(stemmer, text))
+                for pk, title, text in rows.iterator()
+            )
+        )
+
+
+def drop_search_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('DROP TABLE IF EXISTS blog_post_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_outboxemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
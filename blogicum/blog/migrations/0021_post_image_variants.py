@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:30
+
+from pathlib import PurePosixPath
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def fill_image_variants(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias).exclude(
+        image=''
+    )
+    for post in posts.only('pk', 'image').iterator():
+        path = PurePosixPath(post.image.name)
+        for width in (1280, 960, 640):
+            name = PurePosixPath(
+                'variants', path.parent, f'{path.stem}.{width}w.webp'
+            )
+            if default_storage.exists(str(name)):
+                posts.filter(pk=post.pk).update(image_variants=width)
+                break
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0020_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Ширина наибольшего нарезанного варианта, 0 — вариантов нет.', verbose_name='Ширина вариантов изображения'),
+        ),
+        migrations.RunPython(fill_image_variants, migrations.RunPython.noop),
+    ]
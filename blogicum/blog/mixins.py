@@ -1,8 +1,17 @@
+import hashlib
+from http import HTTPStatus
+
+from django.conf import settings
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe, quote_etag
 
+from . import edge, fragments, page_cache, replication
 from .forms import CommentForm, PostForm
 from .models import Comment, Post
+from .paginators import CursorPaginator, FeedPaginator
 
 
 class PostMixin:
@@ -12,16 +21,197 @@ class PostMixin:
     pk_url_kwarg = 'post_id'
 
 
+class ReplicaReadMixin:
+    """Чтения GET-запроса идут на реплику, если пользователь не писал."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or replication.is_pinned(request)):
+            return super().dispatch(request, *args, **kwargs)
+        with replication.replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class CursorPaginationMixin:
+    paginator_class = FeedPaginator
+    cursor_kwarg = 'cursor'
+
+    def get_count_key(self):
+        """Ключ счётчика постов меняется с каждым сбросом области feed."""
+        return f'{self.request.path}:{page_cache.get_version("feed")}'
+
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(
+            *args, count_key=self.get_count_key(), **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        token = self.request.GET.get(self.cursor_kwarg)
+        if token is None:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        page = paginator.page(token)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class PostCardsMixin:
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post_cards'] = fragments.render_cards(context['page_obj'])
+        return context
+
+
+class PageCacheMixin:
+    """Кэш готовых страниц, сбрасываемый по версиям областей.
+
+    Страница, прочитанная с реплики, могла не увидеть запись, версия
+    которой уже учтена, поэтому она хранится не дольше допустимого
+    отставания реплики REPLICA_LAG_SECONDS.
+    """
+
+    cache_scopes = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if not page_cache.is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        response = page_cache.get_page(request)
+        if response is not None:
+            return get_conditional_response(
+                request,
+                etag=edge.personalize_etag(request, response.get('ETag')),
+                last_modified=parse_http_date_safe(
+                    response.get('Last-Modified')
+                ),
+                response=response,
+            )
+        self.cache_snapshot = page_cache.snapshot_versions(self.cache_scopes)
+        response = super().dispatch(request, *args, **kwargs)
+        if (response.status_code == HTTPStatus.OK
+                and hasattr(response, 'add_post_render_callback')):
+            response.add_post_render_callback(self.cache_response)
+        return response
+
+    def is_shared_page(self, context):
+        """Тело страницы одинаково для всех, кому она доступна."""
+        return True
+
+    def cache_response(self, response):
+        if not self.is_shared_page(response.context_data):
+            return
+        page_cache.set_page(
+            self.request,
+            response,
+            self.get_cache_scopes(response.context_data),
+            self.cache_snapshot,
+            timeout=(
+                settings.REPLICA_LAG_SECONDS
+                if replication.read_replica() else None
+            ),
+        )
+
+    def get_cache_scopes(self, context):
+        scopes = list(self.cache_scopes)
+        for post in context.get('page_obj') or ():
+            scopes += page_cache.post_scopes(post)
+        return scopes
+
+
+class ConditionalGetMixin:
+    """Ответ 304 Not Modified по валидаторам без отрисовки шаблона.
+
+    Для условных запросов валидаторы считаются по строкам текущей
+    страницы, выбранным без join'ов к автору и местоположению;
+    для обычных — по уже загруженным для отрисовки объектам.
+
+    Last-Modified не отдаётся: по датам постов не видно ни удалений,
+    ни изменений автора, категории и местоположения, которые тоже
+    выводятся на странице. Страницы проверяются только по ETag.
+    """
+
+    validator_fields = (
+        'pk', 'pub_date', 'updated_at', 'comment_count',
+        'author_id', 'category_id', 'location_id',
+    )
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            posts = self.get_validator_posts()
+            if posts is not None:
+                etag = edge.personalize_etag(
+                    request, self.get_etag(posts)
+                )
+                response = get_conditional_response(request, etag=etag)
+                if response is not None:
+                    response['ETag'] = etag
+                    return response
+        response = super().dispatch(request, *args, **kwargs)
+        if (response.status_code == HTTPStatus.OK
+                and hasattr(response, 'context_data')):
+            response['ETag'] = self.get_etag(
+                self.get_response_posts(response.context_data)
+            )
+        return response
+
+    def get_validator_posts(self):
+        queryset = self.get_queryset().select_related(None).only(
+            *self.validator_fields
+        )
+        return self.paginate_queryset(
+            queryset, self.get_paginate_by(queryset)
+        )[1]
+
+    def get_response_posts(self, context):
+        return context['page_obj']
+
+    def get_etag(self, posts):
+        return quote_etag(self.make_etag(list(posts)))
+
+    def make_etag(self, posts):
+        """Хэш состояния постов и версий их областей.
+
+        Пользователь в тело страницы не попадает: ETag с учётом
+        персональных фрагментов получается в edge.personalize_etag.
+        """
+        scopes = []
+        for post in posts:
+            scopes += page_cache.post_scopes(post)
+        state = [
+            self.request.get_full_path(),
+            sorted(page_cache.get_versions(scopes).items()),
+            [
+                (post.pk, post.updated_at, post.comment_count)
+                for post in posts
+            ],
+        ]
+        return hashlib.md5(repr(state).encode()).hexdigest()
+
+
 class EditMixin:
+    """Доступ к изменению объекта только для автора.
+
+    Объект загружается один раз запросом с фильтром по автору
+    и переиспользуется в get_object.
+    """
 
     def dispatch(self, request, *args, **kwargs):
-        post = super().get_object()
         if not request.user.is_authenticated:
             return redirect('login')
-        if post.author != self.request.user:
+        self.object = self.get_queryset().filter(
+            pk=self.kwargs[self.pk_url_kwarg], author=request.user
+        ).first()
+        if self.object is None:
+            get_object_or_404(
+                self.get_queryset(), pk=self.kwargs[self.pk_url_kwarg]
+            )
             return redirect('blog:post_detail', self.kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.object
+
 
 class CommentMixin:
     model = Comment
@@ -29,9 +219,19 @@ class CommentMixin:
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
+    def post(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().post(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(post_id=self.kwargs['post_id'])
+
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(Post, id=self.kwargs['post_id'])
+        if form.instance.post_id is None:
+            form.instance.post = get_object_or_404(
+                Post, id=self.kwargs['post_id']
+            )
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django_cleanup import cleanup
 
 LIMIT_HEADER = 20
@@ -75,12 +76,55 @@ class Post(PublishedModel):
         'Изображение',
         blank=True
     )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    image_variants = models.PositiveSmallIntegerField(
+        'Ширина вариантов изображения',
+        default=0,
+        editable=False,
+        help_text='Ширина наибольшего нарезанного варианта, 0 — вариантов нет.'
+    )
+    is_visible = models.BooleanField(
+        'Виден на сайте',
+        default=False,
+        editable=False,
+        help_text=('Пост опубликован, время публикации наступило '
+                   'и категория опубликована.')
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = "posts"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_visible_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_visible=False, is_published=True),
+                name='post_scheduled_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+        )
 
     def __str__(self):
         return (f'{self.title[:LIMIT_HEADER]} | {self.text[:LIMIT_TEXT]}')
@@ -134,6 +178,39 @@ class Comment(models.Model):
         verbose_name_plural = "Комментарии"
         default_related_name = "comments"
         ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
 
     def __str__(self):
         return f"Комментарий автора {self.author} к посту {self.post}"
+
+
+class OutboxEmail(models.Model):
+    subject = models.CharField('Тема', max_length=256)
+    message = models.TextField('Текст письма')
+    from_email = models.EmailField('Отправитель')
+    recipient = models.EmailField('Получатель')
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    send_after = models.DateTimeField('Отправить после', default=timezone.now)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('send_after',)
+        indexes = (
+            models.Index(
+                fields=('send_after',),
+                condition=models.Q(sent_at__isnull=True),
+                name='outbox_pending_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.subject[:LIMIT_HEADER]} → {self.recipient}'
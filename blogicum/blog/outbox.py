@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 60
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    return OutboxEmail.objects.bulk_create(
+        OutboxEmail(
+            subject=subject,
+            message=message,
+            from_email=from_email,
+            recipient=recipient,
+        )
+        for recipient in recipient_list if recipient
+    )
+
+
+def get_pending(batch_size):
+    return list(OutboxEmail.objects.filter(
+        sent_at__isnull=True,
+        send_after__lte=timezone.now(),
+        attempts__lt=MAX_ATTEMPTS,
+    )[:batch_size])
+
+
+def send_batch(emails, connection):
+    """Отправить письма через открытое соединение и сохранить результат."""
+    sent = 0
+    for email in emails:
+        email.attempts += 1
+        message = EmailMessage(
+            email.subject,
+            email.message,
+            email.from_email,
+            [email.recipient],
+            connection=connection,
+        )
+        try:
+            message.send()
+        except Exception as error:
+            email.last_error = f'{type(error).__name__}: {error}'
+            email.send_after = timezone.now() + timedelta(
+                seconds=RETRY_DELAY * 2 ** (email.attempts - 1)
+            )
+        else:
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            sent += 1
+    OutboxEmail.objects.bulk_update(
+        emails, ('attempts', 'sent_at', 'send_after', 'last_error')
+    )
+    return sent
+
+
+def drain_outbox(batch_size=100, connection=None):
+    """Разослать все готовые к отправке письма по одному соединению."""
+    sent = 0
+    emails = get_pending(batch_size)
+    if not emails:
+        return sent
+    connection = connection or get_connection()
+    with connection:
+        while emails:
+            sent += send_batch(emails, connection)
+            if len(emails) < batch_size:
+                break
+            emails = get_pending(batch_size)
+    return sent
@@ -0,0 +1,98 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+KEY_PREFIX = 'blog'
+WRITES_SCOPE = 'writes'
+
+
+def get_cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def scope_key(scope):
+    return f'{KEY_PREFIX}:scope:{scope}'
+
+
+def page_key(request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'{KEY_PREFIX}:page:{path}'
+
+
+def post_scopes(post):
+    """Области, от которых зависит отрисованная карточка публикации."""
+    scopes = [f'post:{post.pk}', f'user:{post.author_id}']
+    if post.category_id:
+        scopes.append(f'category:{post.category_id}')
+    if post.location_id:
+        scopes.append(f'location:{post.location_id}')
+    return scopes
+
+
+def invalidate(*scopes):
+    cache = get_cache()
+    for scope in (*scopes, WRITES_SCOPE):
+        try:
+            cache.incr(scope_key(scope))
+        except ValueError:
+            cache.set(scope_key(scope), time.time_ns(), None)
+
+
+def get_versions(scopes):
+    cache = get_cache()
+    keys = {scope_key(scope) for scope in scopes}
+    versions = cache.get_many(keys)
+    for key in keys - versions.keys():
+        cache.add(key, time.time_ns(), None)
+        versions[key] = cache.get(key)
+    return versions
+
+
+def get_version(scope):
+    return get_versions([scope])[scope_key(scope)]
+
+
+def snapshot_versions(scopes=()):
+    """Версии областей до того, как страница выполнит запросы.
+
+    В снимок входит счётчик всех сбросов: если он изменился, пока
+    страница собиралась, её данные могли устареть и в кэш она не идёт.
+    """
+    return get_versions([*scopes, WRITES_SCOPE])
+
+
+def is_cacheable(request):
+    return (
+        settings.PAGE_CACHE_TIMEOUT > 0
+        and request.method in ('GET', 'HEAD')
+    )
+
+
+def get_page(request):
+    cache = get_cache()
+    entry = cache.get(page_key(request))
+    if entry is None:
+        return None
+    versions, response = entry
+    if cache.get_many(versions.keys()) != versions:
+        return None
+    return response
+
+
+def set_page(request, response, scopes, snapshot, timeout=None):
+    """Сохранить страницу, если области не сбрасывались после снимка."""
+    if response.cookies or timeout == 0:
+        return
+    versions = snapshot_versions(scopes)
+    if any(versions[key] != version for key, version in snapshot.items()):
+        return
+    del versions[scope_key(WRITES_SCOPE)]
+    if timeout is None:
+        timeout = settings.PAGE_CACHE_TIMEOUT
+    get_cache().set(
+        page_key(request),
+        (versions, response),
+        min(timeout, settings.PAGE_CACHE_TIMEOUT)
+    )
@@ -0,0 +1,276 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+OFFSET_PAGES = 5
+WINDOW = 2
+COUNT_TIMEOUT = 60 * 5
+MAX_ID = 2 ** 63
+
+
+def encode_cursor(post=None, reverse=False, date_field='pub_date'):
+    data = {'r': int(reverse)}
+    if post is not None:
+        data.update(d=getattr(post, date_field).isoformat(), i=post.pk)
+    token = base64.urlsafe_b64encode(json.dumps(data).encode())
+    return token.decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Вернуть (дату, id, reverse) из токена курсора."""
+    try:
+        data = json.loads(
+            base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        )
+        pub_date = data.get('d') and datetime.fromisoformat(data['d'])
+        pk = pub_date and int(data['i'])
+        if pk and not 0 < pk < MAX_ID:
+            raise OverflowError(pk)
+        return pub_date, pk, bool(data.get('r'))
+    except (ValueError, TypeError, AttributeError, KeyError, OverflowError,
+            OSError):
+        raise Http404('Неверный курсор страницы')
+
+
+def keyset_after(queryset, date_field, date, pk, descending):
+    """Строки после (date, pk) в порядке сортировки по ним.
+
+    Отдельная граница по дате перед OR даёт SQLite поиск по диапазону
+    индекса; одно OR читало бы все строки выше курсора.
+    """
+    if descending:
+        return queryset.filter(**{f'{date_field}__lte': date}).filter(
+            Q(**{f'{date_field}__lt': date})
+            | Q(**{date_field: date, 'pk__lt': pk})
+        )
+    return queryset.filter(**{f'{date_field}__gte': date}).filter(
+        Q(**{f'{date_field}__gt': date})
+        | Q(**{date_field: date, 'pk__gt': pk})
+    )
+
+
+class CursorPage:
+    number = None
+    page_window = ()
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next() and self.object_list:
+            return encode_cursor(
+                self[-1], date_field=self.paginator.date_field
+            )
+
+    @property
+    def previous_cursor(self):
+        if (self.paginator.reversible and self.has_previous()
+                and self.object_list):
+            return encode_cursor(
+                self[0], reverse=True, date_field=self.paginator.date_field
+            )
+
+
+class CursorPaginator:
+    """Keyset-пагинация по (pub_date, id) без OFFSET и COUNT(*)."""
+
+    date_field = 'pub_date'
+    reversible = True
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    @property
+    def last_cursor(self):
+        return encode_cursor(reverse=True)
+
+    def page(self, token):
+        pub_date, pk, reverse = decode_cursor(token)
+        queryset = self.object_list
+        if pub_date:
+            queryset = keyset_after(
+                queryset, self.date_field, pub_date, pk, not reverse
+            )
+        if reverse:
+            queryset = queryset.order_by('pub_date', 'pk')
+        else:
+            queryset = queryset.order_by('-pub_date', '-pk')
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if reverse:
+            object_list.reverse()
+            return CursorPage(
+                object_list, self,
+                has_next=bool(pub_date),
+                has_previous=has_more,
+            )
+        return CursorPage(
+            object_list, self,
+            has_next=has_more,
+            has_previous=bool(pub_date),
+        )
+
+
+class CommentPaginator:
+    """Keyset-пагинация комментариев по (created_at, id) от старых к новым.
+
+    Комментарии листаются только вперёд: обратных курсоров страницы
+    не выдают, а пришедший обратный курсор считается неверным.
+    """
+
+    date_field = 'created_at'
+    reversible = False
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def page(self, token=None):
+        queryset = self.object_list.order_by('created_at', 'pk')
+        if token:
+            created_at, pk, reverse = decode_cursor(token)
+            if reverse:
+                raise Http404('Неверный курсор страницы')
+            if created_at:
+                queryset = keyset_after(
+                    queryset, self.date_field, created_at, pk,
+                    descending=False
+                )
+        object_list = list(queryset[:self.per_page + 1])
+        return CursorPage(
+            object_list[:self.per_page], self,
+            has_next=len(object_list) > self.per_page,
+            has_previous=bool(token),
+        )
+
+
+class FeedPage(Page):
+    """Страница с номером, которая отдаёт курсоры для глубоких переходов."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        return self.number + 1
+
+    @property
+    def page_window(self):
+        last = min(
+            self.number + WINDOW,
+            self.paginator.offset_pages,
+            max(self.paginator.num_pages, self.number + self.has_next()),
+        )
+        return range(max(1, self.number - WINDOW), last + 1)
+
+    @property
+    def next_cursor(self):
+        if self.has_next() and self.number >= self.paginator.offset_pages:
+            return encode_cursor(self[-1])
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous() and self.number > self.paginator.offset_pages:
+            return encode_cursor(self[0], reverse=True)
+
+
+class FeedPaginator(Paginator):
+    """Пагинатор ленты без COUNT(*) на каждый запрос.
+
+    Наличие следующей страницы определяется по лишней строке выборки,
+    а число страниц оценивается по закэшированному COUNT(*).
+    """
+
+    offset_pages = OFFSET_PAGES
+
+    def __init__(self, *args, count_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        return cache.get_or_set(
+            f'blog:count:{self.count_key}',
+            self.object_list.count,
+            COUNT_TIMEOUT
+        )
+
+    @property
+    def last_cursor(self):
+        return encode_cursor(reverse=True)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы должен быть числом')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(
+            self.object_list[bottom:bottom + self.per_page + 1]
+        )
+        if not object_list and number > 1:
+            raise EmptyPage('На странице нет результатов')
+        return FeedPage(
+            object_list[:self.per_page], number, self,
+            has_next=len(object_list) > self.per_page,
+        )
+
+
+class SearchPage(Page):
+
+    @property
+    def page_window(self):
+        return self.paginator.get_elided_page_range(
+            self.number, on_each_side=WINDOW, on_ends=1
+        )
+
+
+class SearchPaginator(Paginator):
+    last_cursor = None
+
+    def _get_page(self, *args, **kwargs):
+        return SearchPage(*args, **kwargs)
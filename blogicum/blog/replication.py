@@ -0,0 +1,97 @@
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+STICKY_COOKIE = 'primary_until'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+_wrote_primary = ContextVar('wrote_primary', default=False)
+_read_replica = ContextVar('read_replica', default=False)
+
+
+def replica_reads_enabled():
+    return _replica_reads.get() and bool(settings.REPLICA_DATABASES)
+
+
+def choose_replica():
+    return random.choice(settings.REPLICA_DATABASES)
+
+
+def mark_write():
+    _wrote_primary.set(True)
+
+
+def mark_replica_read():
+    _read_replica.set(True)
+
+
+def read_replica():
+    """Запрос читал с реплики, которая может отставать от основной базы."""
+    return _read_replica.get()
+
+
+@contextmanager
+def replica_reads():
+    """Направлять чтения внутри блока на реплики."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def is_pinned(request):
+    """Пользователь недавно писал и должен читать с основной базы."""
+    try:
+        return float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReplicaStickinessMiddleware:
+    """Закрепляет чтения за основной базой на время после записи."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _wrote_primary.set(False)
+        read_token = _read_replica.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote_primary.get() and settings.REPLICA_DATABASES:
+                response.set_cookie(
+                    STICKY_COOKIE,
+                    str(int(time.time() + settings.REPLICA_STICKY_SECONDS)),
+                    max_age=settings.REPLICA_STICKY_SECONDS,
+                    httponly=True,
+                    samesite='Lax',
+                )
+            return response
+        finally:
+            _wrote_primary.reset(token)
+            _read_replica.reset(read_token)
+
+
+def copy_database(connection, path):
+    """Скопировать базу соединения Django в файл через backup API."""
+    connection.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        connection.connection.backup(target)
+    finally:
+        target.close()
+
+
+def sync_replicas(aliases=None):
+    """Локальная замена репликации: снимок основной базы в файлы реплик."""
+    aliases = settings.REPLICA_DATABASES if aliases is None else aliases
+    for alias in aliases:
+        path = str(connections[alias].settings_dict['NAME'])
+        copy_database(connections['default'], path)
+    return len(aliases)
@@ -0,0 +1,25 @@
+from django.conf import settings
+
+from . import replication
+
+
+class ReplicaRouter:
+    """Чтения в replica_reads() — на реплики, все записи — в default."""
+
+    def db_for_read(self, model, **hints):
+        if replication.replica_reads_enabled():
+            replication.mark_replica_read()
+            return replication.choose_replica()
+        return None
+
+    def db_for_write(self, model, **hints):
+        replication.mark_write()
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
@@ -0,0 +1,99 @@
+import re
+
+import snowballstemmer
+from django.db import connection
+
+SEARCH_TABLE = 'blog_post_search'
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+RANK_ORDERING = ('rank', '-pub_date')
+
+WORD_RE = re.compile(r'\w+')
+stemmer = snowballstemmer.stemmer('russian')
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def normalize(text):
+    """Привести текст к строке основ слов для индекса FTS5."""
+    return ' '.join(stemmer.stemWords(WORD_RE.findall(text.lower())))
+
+
+def build_match(query):
+    return ' '.join(f'"{word}"*' for word in normalize(query).split())
+
+
+def create_table(cursor):
+    cursor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} '
+        'USING fts5(title, text, tokenize="unicode61")'
+    )
+
+
+def index_rows(cursor, rows):
+    rows = [
+        (pk, normalize(title), normalize(text)) for pk, title, text in rows
+    ]
+    cursor.executemany(
+        f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+        [(pk,) for pk, _, _ in rows]
+    )
+    cursor.executemany(
+        f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) VALUES (%s, %s, %s)',
+        rows
+    )
+
+
+def index_post(post):
+    if is_available():
+        with connection.cursor() as cursor:
+            index_rows(cursor, [(post.pk, post.title, post.text)])
+
+
+def remove_post(post_id):
+    if is_available():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post_id]
+            )
+
+
+def rebuild(queryset, batch_size=2000):
+    indexed = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        rows = []
+        for row in queryset.values_list('pk', 'title', 'text').iterator(
+            chunk_size=batch_size
+        ):
+            rows.append(row)
+            if len(rows) == batch_size:
+                index_rows(cursor, rows)
+                indexed += len(rows)
+                rows = []
+        index_rows(cursor, rows)
+        indexed += len(rows)
+    return indexed
+
+
+def search_posts(queryset, query):
+    """Отфильтровать queryset по запросу и упорядочить по релевантности."""
+    match = build_match(query)
+    if not match:
+        return queryset.none()
+    if not is_available():
+        return queryset.filter(title__icontains=query) | queryset.filter(
+            text__icontains=query
+        )
+    table = connection.ops.quote_name(SEARCH_TABLE)
+    post_id = f'{connection.ops.quote_name(queryset.model._meta.db_table)}.id'
+    # Индекс присоединяется один раз: MATCH выполняется единожды на запрос,
+    # а bm25 берётся из той же строки соединения.
+    return queryset.extra(
+        select={'rank': f'bm25({table}, {TITLE_WEIGHT}, {TEXT_WEIGHT})'},
+        tables=[SEARCH_TABLE],
+        where=[f'{table} MATCH %s', f'{table}.rowid = {post_id}'],
+        params=[match],
+    ).order_by(*RANK_ORDERING)
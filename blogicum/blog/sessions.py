@@ -0,0 +1,25 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+
+def purge_expired_sessions(batch_size=1000, pause=0):
+    """Удалить истёкшие сессии короткими пачками.
+
+    Каждая пачка удаляется отдельным DELETE по первичному ключу, так что
+    блокировка записи держится недолго и не мешает входу пользователей.
+    Записи в кэше сессий истекают сами по тому же сроку.
+    """
+    deleted = 0
+    while True:
+        keys = list(
+            Session.objects.filter(
+                expire_date__lt=timezone.now()
+            ).values_list('session_key', flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+        deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,166 @@
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+from django_cleanup.signals import cleanup_post_delete
+
+from . import images, page_cache, search, visibility
+from .models import Category, Comment, Location, Post, User
+
+# Посты, удаляемые прямо сейчас: их каскадно удаляемым комментариям не
+# нужно ни пересчитывать счётчик, ни сбрасывать кэш страницы по одному.
+_deleting_posts = ContextVar('deleting_posts', default=frozenset())
+
+
+def store_image_variants(post_id, width):
+    Post.objects.filter(pk=post_id).update(
+        image_variants=width, updated_at=timezone.now()
+    )
+    page_cache.invalidate(f'post:{post_id}')
+
+
+def change_comment_count(post_id, delta):
+    """Сдвинуть счётчик комментариев, не опуская его ниже нуля."""
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F('comment_count') + delta, 0),
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    instance._loaded_post_id = instance.__dict__.get('post_id')
+
+
+@receiver(post_init, sender=Post)
+def remember_post_category(sender, instance, **kwargs):
+    instance._loaded_category_id = instance.__dict__.get('category_id')
+    instance._loaded_image = str(instance.__dict__.get('image') or '')
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        change_comment_count(instance.post_id, 1)
+    elif instance._loaded_post_id != instance.post_id:
+        change_comment_count(instance._loaded_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+        page_cache.invalidate(f'post:{instance._loaded_post_id}')
+    else:
+        Post.objects.filter(pk=instance.post_id).update(
+            updated_at=timezone.now()
+        )
+    instance._loaded_post_id = instance.post_id
+    page_cache.invalidate(f'post:{instance.post_id}')
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleting_post(sender, instance, **kwargs):
+    _deleting_posts.set(_deleting_posts.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post(sender, instance, **kwargs):
+    _deleting_posts.set(_deleting_posts.get() - {instance.pk})
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    if instance.post_id in _deleting_posts.get():
+        return
+    change_comment_count(instance.post_id, -1)
+    page_cache.invalidate(f'post:{instance.post_id}')
+
+
+@receiver(pre_save, sender=Post)
+def set_post_visibility(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance.is_visible = visibility.is_post_visible(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    scopes = {'feed', f'post:{instance.pk}'}
+    for category_id in (instance._loaded_category_id, instance.category_id):
+        if category_id:
+            scopes.add(f'category:{category_id}')
+    page_cache.invalidate(*scopes)
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, **kwargs):
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    search.remove_post(instance.pk)
+
+
+@receiver(pre_save, sender=Post)
+def reset_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw and str(instance.image or '') != instance._loaded_image:
+        instance.image_variants = 0
+
+
+@receiver(post_save, sender=Post)
+def schedule_image_variants(sender, instance, raw=False, **kwargs):
+    if raw or not instance.image or instance.image.name == (
+        instance._loaded_image
+    ):
+        return
+    instance._loaded_image = instance.image.name
+    transaction.on_commit(lambda: images.generate_variants(
+        instance.image,
+        callback=partial(store_image_variants, instance.pk)
+    ))
+
+
+@receiver(cleanup_post_delete)
+def delete_image_variants(sender, file_name, file, **kwargs):
+    if sender is Post:
+        images.delete_variants(file_name, file.storage)
+
+
+@receiver(post_init, sender=Category)
+def remember_category_state(sender, instance, **kwargs):
+    instance._loaded_is_published = instance.__dict__.get('is_published')
+
+
+@receiver(post_save, sender=Category)
+def update_category_visibility(sender, instance, raw=False, **kwargs):
+    if not raw and instance._loaded_is_published != instance.is_published:
+        visibility.update_category_posts(instance)
+    instance._loaded_is_published = instance.is_published
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(sender, instance, **kwargs):
+    Post.objects.filter(category=instance).update(is_visible=False)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_pages(sender, instance, **kwargs):
+    page_cache.invalidate('feed', f'category:{instance.pk}')
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_pages(sender, instance, **kwargs):
+    page_cache.invalidate(f'location:{instance.pk}')
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_pages(sender, instance, **kwargs):
+    page_cache.invalidate(f'user:{instance.pk}')
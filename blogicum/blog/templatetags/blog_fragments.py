@@ -0,0 +1,17 @@
+from django import template
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.utils.safestring import mark_safe
+
+from blog.edge import include_tag
+
+register = template.Library()
+
+
+@register.simple_tag
+def edge_include(view_name, *args, **query):
+    url = reverse(view_name, args=args)
+    query = {key: value for key, value in query.items() if value}
+    if query:
+        url = f'{url}?{urlencode(query)}'
+    return mark_safe(include_tag(url))
@@ -0,0 +1,23 @@
+from django import template
+
+from blog.images import (SIZES, VARIANT_WIDTHS, WEBP, fallback_extension,
+                         get_srcset, variant_name)
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/responsive_image.html')
+def responsive_image(post, variant='card'):
+    image, width = post.image, VARIANT_WIDTHS[variant]
+    return {
+        'src': (
+            image.storage.url(
+                variant_name(image.name, width, fallback_extension(image.name))
+            ) if width <= post.image_variants else image.url
+        ),
+        'srcset': get_srcset(
+            image, fallback_extension(image.name), post.image_variants
+        ),
+        'webp_srcset': get_srcset(image, WEBP, post.image_variants),
+        'sizes': SIZES[variant],
+    }
@@ -1,6 +1,6 @@
 from django.urls import include, path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 
@@ -11,6 +11,23 @@ post_urls = [
         views.BlogPostDetail.as_view(),
         name='post_detail'
     ),
+    path(
+        '<int:post_id>/comments/',
+        views.BlogPostComments.as_view(),
+        name='post_comments'
+    ),
+    path(
+        '<int:post_id>/fragments/controls/',
+        views.OwnerControlsFragment.as_view(
+            template_name='includes/post_controls.html'
+        ),
+        name='post_controls'
+    ),
+    path(
+        '<int:post_id>/fragments/comment-form/',
+        views.CommentFormFragment.as_view(),
+        name='comment_form'
+    ),
     path(
         '<int:post_id>/edit/',
         views.BlogPostEdit.as_view(),
@@ -53,11 +70,33 @@ urlpatterns = [
     path('posts/',
          include(post_urls)
          ),
+    path(
+        'fragments/header/',
+        views.HeaderFragment.as_view(),
+        name='header_fragment'
+    ),
+    path('feed/rss/', feeds.LatestPostsFeed(), name='feed_rss'),
+    path('feed/atom/', feeds.LatestPostsAtomFeed(), name='feed_atom'),
     path(
         'category/<str:category_slug>/',
         views.BlogCategoryPosts.as_view(),
         name='category_posts'
     ),
+    path(
+        'category/<str:category_slug>/feed/rss/',
+        feeds.CategoryPostsFeed(),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<str:category_slug>/feed/atom/',
+        feeds.CategoryPostsAtomFeed(),
+        name='category_feed_atom'
+    ),
+    path(
+        'search/',
+        views.PostSearchView.as_view(),
+        name='search'
+    ),
     path(
         'profile/edit/',
         views.ProfileEditView.as_view(),
@@ -68,4 +107,14 @@ urlpatterns = [
         views.ProfileDetailView.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<str:username>/feed/rss/',
+        feeds.AuthorPostsFeed(),
+        name='author_feed_rss'
+    ),
+    path(
+        'profile/<str:username>/feed/atom/',
+        feeds.AuthorPostsAtomFeed(),
+        name='author_feed_atom'
+    ),
 ]
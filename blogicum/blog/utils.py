@@ -1,6 +1,3 @@
-from django.db.models import Count
-from django.utils import timezone
-
 from .models import Post
 
 
@@ -10,13 +7,10 @@ def get_unfiltred_post():
         'category',
         'location',
     ).order_by(
-        '-pub_date'
-    ).annotate(comment_count=Count('comments'))
+        '-pub_date',
+        '-id',
+    )
 
 
 def filter_published_posts(queryset):
-    return queryset.filter(
-        is_published=True,
-        pub_date__lte=timezone.now(),
-        category__is_published=True
-    )
+    return queryset.filter(is_visible=True)
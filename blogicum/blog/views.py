@@ -1,27 +1,37 @@
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.mail import send_mail
-from django.http import Http404
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import urlencode
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
+                                  TemplateView, UpdateView)
 
 from blogicum.settings import EMAIL_ADRESS
 
+from . import instrumentation, page_cache, search
 from .forms import CommentForm, UserUpdateForm
-from .mixins import CommentMixin, EditMixin, PostMixin
+from .mixins import (CommentMixin, ConditionalGetMixin, CursorPaginationMixin,
+                     EditMixin, PageCacheMixin, PostCardsMixin, PostMixin,
+                     ReplicaReadMixin)
 from .models import Category, Post, User
+from .outbox import enqueue_mail
+from .paginators import CommentPaginator, SearchPaginator
 from .utils import filter_published_posts, get_unfiltred_post
 
 POST_PER_PAGE = 10
+COMMENTS_PER_PAGE = 20
 
 
-class BlogCategoryPosts(ListView):
+class BlogCategoryPosts(ReplicaReadMixin, PageCacheMixin, ConditionalGetMixin,
+                        PostCardsMixin, CursorPaginationMixin, ListView):
     model = Post
     template_name = 'blog/category.html'
     paginate_by = POST_PER_PAGE
-    ordering = '-pub_date'
+    query_budget = 6
 
     def get_queryset(self):
         slug = self.kwargs['category_slug']
@@ -30,10 +40,8 @@ class BlogCategoryPosts(ListView):
             slug=slug,
             is_published=True
         )
-        return get_unfiltred_post().filter(
-            category=self.category,
-            is_published=True,
-            pub_date__lte=timezone.now()
+        return filter_published_posts(get_unfiltred_post()).filter(
+            category=self.category
         )
 
     def get_context_data(self, **kwargs):
@@ -41,30 +49,60 @@ class BlogCategoryPosts(ListView):
         context['category'] = self.category
         return context
 
+    def get_cache_scopes(self, context):
+        scopes = super().get_cache_scopes(context)
+        return scopes + [f'category:{self.category.pk}']
 
-class IndexViewList(ListView):
+
+class IndexViewList(ReplicaReadMixin, PageCacheMixin, ConditionalGetMixin,
+                    PostCardsMixin, CursorPaginationMixin, ListView):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = POST_PER_PAGE
+    query_budget = 5
+    cache_scopes = ('feed',)
 
     def get_queryset(self):
         queryset = get_unfiltred_post()
         return filter_published_posts(queryset)
 
 
+class PostSearchView(PostCardsMixin, ListView):
+    model = Post
+    template_name = 'blog/search.html'
+    paginate_by = POST_PER_PAGE
+    paginator_class = SearchPaginator
+    query_budget = 4
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return search.search_posts(
+            filter_published_posts(get_unfiltred_post()), self.query
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['page_query'] = urlencode({'q': self.query}) + '&'
+        return context
+
+
 class BlogCreateView(LoginRequiredMixin, PostMixin, CreateView):
+    query_budget = 14
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        self.mail()
-        return super().form_valid(form)
+        with transaction.atomic():
+            response = super().form_valid(form)
+            self.mail()
+        return response
 
     def get_success_url(self):
         return reverse(
             'blog:profile', kwargs={'username': self.request.user})
 
     def mail(self):
-        send_mail(
+        enqueue_mail(
             subject='Привет',
             message='Вы опубликоали пост',
             from_email=EMAIL_ADRESS,
@@ -72,37 +110,114 @@ class BlogCreateView(LoginRequiredMixin, PostMixin, CreateView):
         )
 
 
-class BlogPostDetail(DetailView):
+class BlogPostDetail(ReplicaReadMixin, PageCacheMixin, ConditionalGetMixin,
+                     DetailView):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
+    query_budget = 8
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'author', 'category', 'location'
+        )
 
     def get_object(self, queryset=None):
         post = super().get_object(queryset=queryset)
-        if post.author != self.request.user:
-            if any(
-                [
-                    post.pub_date >= timezone.now(),
-                    not post.is_published,
-                    not post.category.is_published,
-                ]
-            ):
-                raise Http404("Пост не найден")
+        if post.author != self.request.user and not post.is_visible:
+            raise Http404("Пост не найден")
         return post
 
+    def get_validator_posts(self):
+        visible = Q(is_visible=True)
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
+        post = Post.objects.filter(
+            visible, pk=self.kwargs[self.pk_url_kwarg]
+        ).only(*self.validator_fields).first()
+        return post and [post]
+
+    def get_response_posts(self, context):
+        return [context['object']]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['form'] = CommentForm()
+        return context
+
+    def is_shared_page(self, context):
+        return context['object'].is_visible
+
+    def get_cache_scopes(self, context):
+        return page_cache.post_scopes(self.object)
+
+
+class BlogPostComments(ReplicaReadMixin, TemplateView):
+    """Страница комментариев вместе с кнопками автора одним фрагментом.
+
+    Подставляется в общее тело страницы поста и отдаётся отдельно при
+    подгрузке следующих страниц.
+    """
+
+    template_name = 'includes/comment_list.html'
+    query_budget = 4
+
+    def get_post(self):
+        visible = Q(is_visible=True)
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
+        return get_object_or_404(
+            Post.objects.filter(visible).only('pk'),
+            pk=self.kwargs['post_id']
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        post = self.get_post()
+        paginator = CommentPaginator(
+            post.comments.select_related('author'), COMMENTS_PER_PAGE
+        )
+        context['post'] = post
+        context['comments'] = paginator.page(self.request.GET.get('cursor'))
+        return context
+
+
+class HeaderFragment(TemplateView):
+    template_name = 'includes/header_user.html'
+    query_budget = 2
+
+
+class OwnerControlsFragment(TemplateView):
+    """Кнопки правки и удаления, видимые только автору."""
+
+    query_budget = 2
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        user = self.request.user
+        context['is_owner'] = (
+            user.is_authenticated
+            and str(user.pk) == self.request.GET.get('author')
+        )
+        return context
+
+
+class CommentFormFragment(TemplateView):
+    template_name = 'includes/comment_form.html'
+    query_budget = 2
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.all(
-        ).select_related('author')
         return context
 
 
 class BlogPostEdit(EditMixin, PostMixin, UpdateView):
-    pass
+    query_budget = 12
 
 
 class BlogPostDelete(LoginRequiredMixin, EditMixin, PostMixin, DeleteView):
+    query_budget = 14
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -116,22 +231,29 @@ class BlogPostDelete(LoginRequiredMixin, EditMixin, PostMixin, DeleteView):
 
 
 class BlogCommentAdd(LoginRequiredMixin, CommentMixin, CreateView):
-    pass
+    query_budget = 8
 
 
 class BlogCommentEdit(LoginRequiredMixin, CommentMixin, EditMixin, UpdateView):
-    pass
+    query_budget = 10
 
 
 class BlogCommentDelete(LoginRequiredMixin, EditMixin, CommentMixin,
                         DeleteView):
-    pass
+    query_budget = 10
 
 
-class ProfileDetailView(ListView):
+class ProfileDetailView(ReplicaReadMixin, PostCardsMixin,
+                        CursorPaginationMixin, ListView):
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = POST_PER_PAGE
+    query_budget = 6
+
+    def get_count_key(self):
+        if self.request.user.username == self.kwargs['username']:
+            return f'{super().get_count_key()}:author'
+        return super().get_count_key()
 
     def get_queryset(self):
         if self.request.user.username == self.kwargs['username']:
@@ -156,9 +278,20 @@ class ProfileDetailView(ListView):
 class ProfileEditView(LoginRequiredMixin, UpdateView):
     form_class = UserUpdateForm
     template_name = 'blog/user.html'
+    query_budget = 10
 
     def get_object(self, queryset=None):
         return User.objects.get(username=self.request.user.username)
 
     def get_success_url(self):
         return reverse("blog:profile", kwargs={"username": self.request.user})
+
+
+@staff_member_required
+@instrumentation.query_budget(2)
+def request_metrics(request):
+    if request.GET.get('reset'):
+        instrumentation.reset()
+    return JsonResponse(
+        instrumentation.snapshot(), json_dumps_params={'ensure_ascii': False}
+    )
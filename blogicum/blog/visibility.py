@@ -0,0 +1,70 @@
+from django.db.models import Q
+from django.utils import timezone
+
+from . import page_cache
+from .models import Post
+
+
+def is_post_visible(post, now=None):
+    return bool(
+        post.is_published
+        and post.pub_date <= (now or timezone.now())
+        and post.category_id
+        and post.category.is_published
+    )
+
+
+def visible_posts_q(now=None):
+    return Q(
+        is_published=True,
+        pub_date__lte=now or timezone.now(),
+        category__is_published=True,
+    )
+
+
+def update_category_posts(category):
+    """Пересчитать видимость постов после изменения категории."""
+    posts = Post.objects.filter(category=category)
+    if category.is_published:
+        return posts.filter(
+            visible_posts_q(), is_visible=False
+        ).update(is_visible=True)
+    return posts.filter(is_visible=True).update(is_visible=False)
+
+
+def rebuild_visibility():
+    now = timezone.now()
+    hidden = Post.objects.filter(is_visible=True).exclude(
+        visible_posts_q(now)
+    ).update(is_visible=False)
+    shown = Post.objects.filter(
+        visible_posts_q(now), is_visible=False
+    ).update(is_visible=True)
+    return hidden + shown
+
+
+def publish_scheduled(batch_size=500):
+    """Сделать видимыми наступившие отложенные публикации пачками.
+
+    Возвращает число опубликованных постов; кэш страниц и счётчики
+    постов в пагинации сбрасываются по областям затронутых постов.
+    """
+    published = 0
+    while True:
+        posts = list(
+            Post.objects.filter(
+                visible_posts_q(), is_visible=False
+            ).order_by('pub_date').only(
+                'pk', 'author_id', 'category_id', 'location_id'
+            )[:batch_size]
+        )
+        if not posts:
+            return published
+        Post.objects.filter(
+            pk__in=[post.pk for post in posts]
+        ).update(is_visible=True, updated_at=timezone.now())
+        scopes = {'feed'}
+        for post in posts:
+            scopes.update(page_cache.post_scopes(post))
+        page_cache.invalidate(*scopes)
+        published += len(posts)
@@ -0,0 +1,111 @@
+"""Сжатие ответов gzip или brotli по заголовку Accept-Encoding."""
+import zlib
+
+import brotli
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from blogicum.staticfiles import accepted_encodings
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript',
+    'application/xml', 'application/rss+xml', 'application/atom+xml',
+    'image/svg+xml',
+)
+MIN_LENGTH = 200
+
+
+class Compressor:
+    """Единый интерфейс к zlib и brotli для потокового сжатия."""
+
+    def __init__(self, encoding, level):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=level)
+            self.compress = compressor.process
+            self.flush = compressor.flush
+            self.finish = compressor.finish
+        else:
+            compressor = zlib.compressobj(
+                level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+            self.compress = compressor.compress
+            self.flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = compressor.flush
+
+
+def compress_bytes(data, encoding, level):
+    compressor = Compressor(encoding, level)
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(chunks, encoding, level):
+    """Сжимать поток по частям, сбрасывая каждую часть клиенту сразу."""
+    compressor = Compressor(encoding, level)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def choose_encoding(request):
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def is_compressible(request, response):
+    return (
+        not request.META.get('CSRF_COOKIE_USED')
+        and 200 <= response.status_code < 300
+        and response.status_code not in (204, 206)
+        and not response.has_header('Content-Encoding')
+        and response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)
+    )
+
+
+class CompressionMiddleware:
+    """Сжимает текстовые ответы, обычные и потоковые.
+
+    Уже сжатые форматы (изображения, архивы, шрифты) не трогаются:
+    сжимаются только типы из COMPRESSIBLE_TYPES. Степень сжатия для
+    каждого кодирования задаётся в RESPONSE_COMPRESSION_LEVELS.
+
+    Ответы, в которые отрисован CSRF-токен (формы), отдаются без сжатия:
+    токен рядом с данными пользователя в сжатом ответе раскрывается
+    атакой BREACH по длине ответа.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not is_compressible(request, response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+        level = settings.RESPONSE_COMPRESSION_LEVELS[encoding]
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding, level
+            )
+            del response['Content-Length']
+        else:
+            if len(response.content) < MIN_LENGTH:
+                return response
+            compressed = compress_bytes(response.content, encoding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,39 @@
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+def configure_connection(connection, pragmas):
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с прагмами и режимом транзакций из OPTIONS.
+
+    OPTIONS['pragmas'] выполняются на каждом новом соединении,
+    OPTIONS['transaction_mode'] задаёт BEGIN для transaction.atomic:
+    с IMMEDIATE пишущая транзакция берёт блокировку сразу и ждёт её
+    в пределах timeout, а не падает с «database is locked» при
+    повышении блокировки чтения до записи.
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = params.pop('pragmas', {})
+        self.transaction_mode = params.pop('transaction_mode', None)
+        if self.transaction_mode not in (None, *TRANSACTION_MODES):
+            raise ValueError(
+                f'Неизвестный режим транзакций: {self.transaction_mode}'
+            )
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        configure_connection(connection, self.pragmas)
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode is None:
+            return super()._start_transaction_under_autocommit()
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -25,16 +27,34 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.instrumentation.RequestMetricsMiddleware',
+    'blog.replication.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'blogicum.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.edge.EdgeIncludeMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# Server-Timing раскрывает внутренние тайминги и число запросов к БД,
+# поэтому в продакшене включается только явно: BLOGICUM_SERVER_TIMING=1.
+SERVER_TIMING_HEADER = DEBUG or os.getenv('BLOGICUM_SERVER_TIMING') == '1'
+
+# Уровень gzip (1–9) и качество brotli (0–11); сравнение затрат CPU
+# с выигрышем в байтах: manage.py benchmark_compression.
+RESPONSE_COMPRESSION_LEVELS = {'gzip': 6, 'br': 4}
+
+# Проверка бюджета запросов: None — выключена, 'log' — предупреждение
+# в лог, 'raise' — исключение (включается в тестах, см. tests/conftest.py).
+QUERY_BUDGET_MODE = 'log' if DEBUG else None
+
+QUERY_BUDGET_SAMPLE_RATE = 1.0 if DEBUG else 0.01
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
@@ -45,6 +65,8 @@ LOGIN_REDIRECT_URL = 'blog:index'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+IMAGE_VARIANT_WORKERS = 2
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -76,13 +98,86 @@ TEMPLATES = [
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'blogicum.db_backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60 * 10,
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': SQLITE_PRAGMAS,
+        },
     }
 }
 
+REPLICA_DATABASES = [
+    f'replica{number}'
+    for number in range(1, int(os.getenv('BLOGICUM_DB_REPLICAS', 0)) + 1)
+]
+
+for alias in REPLICA_DATABASES:
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / f'db.{alias}.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+# Допустимое отставание реплик: столько после записи пользователь читает
+# с основной базы и столько живут страницы кэша, прочитанные с реплики.
+REPLICA_LAG_SECONDS = 15
+
+REPLICA_STICKY_SECONDS = REPLICA_LAG_SECONDS
+
+# Кэш общий для всех процессов на машине: версии областей кэша страниц
+# и счётчики постов, сброшенные воркером или manage.py publish_scheduled,
+# сразу видны остальным. Для нескольких машин здесь нужен memcached.
+CACHE_DIR = Path(
+    os.getenv('BLOGICUM_CACHE_DIR', Path(tempfile.gettempdir()) / 'blogicum')
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'default',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'pages',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'sessions',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Сессии читаются из кэша, а пишутся и в кэш, и в базу: промах кэша
+# или его сброс не разлогинивает пользователя. Кэш сессий общий для всех
+# процессов, иначе после выхода в одном воркере сессия жила бы в других.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+SESSION_CACHE_ALIAS = 'sessions'
+
+PAGE_CACHE_ALIAS = 'pages'
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+# False, если SSI-метки персональных фрагментов подставляет nginx (ssi on).
+EDGE_INCLUDES_IN_PROCESS = True
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -113,5 +208,11 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'static'
+
+STATICFILES_STORAGE = (
+    'blogicum.staticfiles.CompressedManifestStaticFilesStorage'
+)
+
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
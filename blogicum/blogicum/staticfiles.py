@@ -0,0 +1,185 @@
+"""Статика с хэшами в именах, заранее сжатая gzip и brotli.
+
+collectstatic пишет рядом с каждым текстовым файлом копии ``.gz``
+и ``.br``, а WSGI-слой PrecompressedStaticFiles отдаёт их из
+STATIC_ROOT сам, не доходя до Django.
+"""
+import gzip
+import json
+import mimetypes
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import urlparse
+
+import brotli
+from django.conf import settings
+from django.contrib.staticfiles.storage import (ManifestStaticFilesStorage,
+                                                StaticFilesStorage)
+from django.core.files.base import ContentFile
+
+COMPRESSIBLE = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.html', '.json', '.xml',
+)
+MIN_SIZE = 256
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+CACHE_CONTROL = 'public, max-age=60'
+BLOCK_SIZE = 64 * 1024
+
+
+def compress(content):
+    """Сжатые варианты содержимого, которые заметно меньше исходного."""
+    variants = [
+        ('.gz', gzip.compress(content, 9, mtime=0)),
+        ('.br', brotli.compress(content, quality=11)),
+    ]
+    return [
+        (suffix, data) for suffix, data in variants
+        if len(data) < len(content) * 0.95
+    ]
+
+
+def accepted_encodings(header):
+    accepted = set()
+    for token in header.split(','):
+        encoding, _, params = token.partition(';')
+        try:
+            quality = float(params.partition('q=')[2] or 1)
+        except ValueError:
+            quality = 0
+        if quality > 0:
+            accepted.add(encoding.strip().lower())
+    return accepted
+
+
+def read_blocks(file):
+    with file:
+        yield from iter(lambda: file.read(BLOCK_SIZE), b'')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хэшами имён и сжатые копии каждого текстового файла.
+
+    Пока collectstatic не запускался и манифеста нет, ссылки строятся
+    на исходные имена, как у обычного StaticFilesStorage.
+    """
+
+    def url(self, name, force=False):
+        if not self.hashed_files and not force:
+            return StaticFilesStorage.url(self, name)
+        return super().url(name, force)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name, hashed_name in self.hashed_files.items():
+            for path in {name, hashed_name}:
+                for compressed in self.compress_file(path):
+                    yield path, compressed, True
+
+    def compress_file(self, name):
+        if not name.endswith(COMPRESSIBLE) or not self.exists(name):
+            return []
+        with self.open(name) as file:
+            content = file.read()
+        if len(content) < MIN_SIZE:
+            return []
+        written = []
+        for suffix, data in compress(content):
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            written.append(self.save(name + suffix, ContentFile(data)))
+        return written
+
+
+class StaticFile:
+    """Файл из STATIC_ROOT с заранее посчитанными заголовками."""
+
+    def __init__(self, path, immutable):
+        content_type, _ = mimetypes.guess_type(path.name)
+        common = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Cache-Control',
+             IMMUTABLE_CACHE_CONTROL if immutable else CACHE_CONTROL),
+        ]
+        self.variants = []
+        for encoding, suffix in ENCODINGS + ((None, ''),):
+            variant = path.with_name(path.name + suffix)
+            if not variant.is_file():
+                continue
+            stat = variant.stat()
+            headers = common + [
+                ('Content-Length', str(stat.st_size)),
+                ('Last-Modified', formatdate(stat.st_mtime, usegmt=True)),
+                ('ETag', f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'),
+            ]
+            if encoding:
+                headers.append(('Content-Encoding', encoding))
+            self.variants.append((encoding, variant, headers))
+        if len(self.variants) > 1:
+            for _, _, headers in self.variants:
+                headers.append(('Vary', 'Accept-Encoding'))
+
+    def choose(self, accept_encoding):
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, path, headers in self.variants:
+            if encoding is None or encoding in accepted:
+                return path, headers
+
+    def serve(self, environ, start_response):
+        path, headers = self.choose(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        etag = dict(headers)['ETag']
+        if environ.get('HTTP_IF_NONE_MATCH') == etag:
+            start_response('304 Not Modified', [
+                header for header in headers
+                if header[0] in ('Cache-Control', 'ETag', 'Vary')
+            ])
+            return []
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        file = path.open('rb')
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper is not None:
+            return file_wrapper(file, BLOCK_SIZE)
+        return read_blocks(file)
+
+
+class PrecompressedStaticFiles:
+    """WSGI-слой, отдающий собранную статику мимо Django.
+
+    Содержимое STATIC_ROOT читается один раз при старте, поэтому после
+    collectstatic процесс нужно перезапустить. Файлы из манифеста имеют
+    хэш в имени и кэшируются навсегда, остальные — на минуту.
+    """
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.root = root or settings.STATIC_ROOT
+        self.prefix = prefix or urlparse(settings.STATIC_URL).path
+        self.files = self.scan()
+
+    def scan(self):
+        if not self.root or not Path(self.root).is_dir():
+            return {}
+        root = Path(self.root)
+        manifest = root / ManifestStaticFilesStorage.manifest_name
+        immutable = set()
+        if manifest.is_file():
+            immutable = set(
+                json.loads(manifest.read_text())['paths'].values()
+            )
+        files = {}
+        for path in root.rglob('*'):
+            if path.suffix in ('.gz', '.br') or not path.is_file():
+                continue
+            name = path.relative_to(root).as_posix()
+            files[self.prefix + name] = StaticFile(path, name in immutable)
+        return files
+
+    def __call__(self, environ, start_response):
+        static = self.files.get(environ.get('PATH_INFO', ''))
+        if static is None or environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+            return self.application(environ, start_response)
+        return static.serve(environ, start_response)
@@ -5,10 +5,13 @@ from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from blog.views import request_metrics
+
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.internal_server_error'
 
 urlpatterns = [
+    path('admin/metrics/', request_metrics, name='request_metrics'),
     path('admin/', admin.site.urls),
     path('pages/', include('pages.urls', namespace='pages')),
     path('', include('blog.urls', namespace='blog')),
@@ -5,3 +5,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+from blogicum.staticfiles import PrecompressedStaticFiles  # noqa: E402
+
+application = PrecompressedStaticFiles(application)
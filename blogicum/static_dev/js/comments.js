@@ -0,0 +1,18 @@
+document.addEventListener('DOMContentLoaded', function () {
+  var comments = document.getElementById('comments');
+  if (!comments) {
+    return;
+  }
+  comments.addEventListener('click', function (event) {
+    var link = event.target.closest('[data-more-comments]');
+    if (!link) {
+      return;
+    }
+    event.preventDefault();
+    fetch(link.dataset.url).then(function (response) {
+      return response.text();
+    }).then(function (html) {
+      link.outerHTML = html;
+    });
+  });
+});
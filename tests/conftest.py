@@ -1,5 +1,7 @@
 import os
 import re
+import subprocess
+import sys
 import time
 from http import HTTPStatus
 from inspect import getsource
@@ -41,6 +43,47 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def raise_on_query_budget():
+    with override_settings(
+            QUERY_BUDGET_MODE="raise", QUERY_BUDGET_SAMPLE_RATE=1.0
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def page_cache_only_when_marked(request, settings):
+    """Страница из кэша не отрисовывается и не даёт контекста шаблона,
+    поэтому кэш страниц включается только в тестах с меткой page_cache.
+    """
+    if request.node.get_closest_marker("page_cache") is None:
+        settings.PAGE_CACHE_TIMEOUT = 0
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from django.core.cache import caches
+
+    for cache in caches.all():
+        cache.clear()
+
+
+def run_in_another_process(code):
+    """Выполнить код в отдельном процессе Django, как другой воркер."""
+    subprocess.run(
+        [sys.executable, "-c", f"import django; django.setup(); {code}"],
+        cwd=Path(__file__).resolve().parent.parent / "blogicum",
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "blogicum.settings"},
+        check=True,
+    )
+
+
+def invalidate_in_another_process(*scopes):
+    run_in_another_process(
+        f"from blog import page_cache; page_cache.invalidate(*{scopes!r})"
+    )
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -363,6 +406,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
@@ -0,0 +1,86 @@
+import pytest
+
+from blog.benchmarks import (build_scenarios, compare, percentile,
+                             run_scenario)
+from blog.models import Comment, Post
+
+BASELINE = {"p95_ms": 100.0, "rps": 200.0, "queries_per_request": 4.0}
+
+
+@pytest.mark.parametrize(
+    "share, expected", [(0, 1), (0.5, 50), (0.95, 95), (0.99, 99), (1, 100)]
+)
+def test_percentile_uses_nearest_rank(share, expected):
+    values = list(range(100, 0, -1))
+    assert percentile(values, share) == expected, (
+        "Убедитесь, что перцентиль считается методом ближайшего ранга."
+    )
+    assert percentile([7.5], share) == 7.5
+
+
+def test_compare_flags_regressions_above_threshold():
+    results = {
+        "stable": dict(BASELINE, p95_ms=105.0, rps=195.0),
+        "slower": dict(BASELINE, p95_ms=130.0),
+        "fewer_rps": dict(BASELINE, rps=150.0),
+        "more_queries": dict(BASELINE, queries_per_request=6.0),
+        "new": dict(BASELINE, p95_ms=1000.0),
+    }
+    baseline = {
+        name: BASELINE for name in ("stable", "slower", "fewer_rps",
+                                    "more_queries")
+    }
+    regressions = compare(results, baseline, threshold=0.1)
+    assert regressions.keys() == {"slower", "fewer_rps", "more_queries"}, (
+        "Убедитесь, что регрессией считается ухудшение больше порога, а "
+        "сценарии без базовой линии пропускаются."
+    )
+    assert regressions["slower"]["p95_ms"] == 0.3
+    assert regressions["fewer_rps"]["rps"] == 0.25
+    assert regressions["more_queries"]["queries_per_request"] == 2.0
+
+
+@pytest.mark.django_db
+def test_build_scenarios_cover_routes(post_with_published_location):
+    scenarios = {
+        scenario.name: scenario for scenario in build_scenarios(per_page=10)
+    }
+    post = post_with_published_location
+    assert scenarios["post_detail"].path == f"/posts/{post.id}/"
+    assert scenarios["index_deep"].path == "/?page=2"
+    assert scenarios["create_post"].method == "POST"
+    assert scenarios["post_detail_auth"].user == post.author
+    assert scenarios["post_comments"].path == f"/posts/{post.id}/comments/"
+    assert scenarios["feed_atom"].path == "/feed/atom/"
+    assert scenarios["comment_form_fragment"].path == (
+        f"/posts/{post.id}/fragments/comment-form/"
+    )
+    assert scenarios["delete_post"].prepare() != (
+        scenarios["delete_post"].prepare()
+    ), "Удаление поста должно каждый раз получать новый пост."
+
+
+@pytest.mark.django_db
+def test_build_scenarios_without_posts():
+    assert build_scenarios(per_page=10) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_destructive_scenarios_get_fresh_objects(
+        settings, mixer, post_with_published_location
+):
+    from blogicum.wsgi import application
+
+    settings.PAGE_CACHE_TIMEOUT = 0
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=post.author)
+    scenarios = {
+        scenario.name: scenario for scenario in build_scenarios(per_page=10)
+    }
+    for name in ("edit_post", "delete_post", "delete_comment"):
+        result = run_scenario(application, scenarios[name], 3, warmup=1)
+        assert result["statuses"] == [302], (
+            f"Убедитесь, что сценарий {name} каждый раз выполняет запись."
+        )
+    assert Post.objects.filter(pk=post.pk).exists()
+    assert Comment.objects.filter(post=post).count() == 1
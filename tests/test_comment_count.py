@@ -0,0 +1,85 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import page_cache
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_add_and_delete(
+        user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что счётчик комментариев увеличивается при добавлении."
+    )
+    comment = Comment.objects.get(post=post)
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что счётчик комментариев уменьшается при удалении."
+    )
+
+
+def test_comment_count_follows_moves_and_cascades(
+        mixer, post_with_published_location, post_of_another_author
+):
+    post, another = post_with_published_location, post_of_another_author
+    comment = mixer.blend("blog.Comment", post=post)
+    mixer.blend("blog.Comment", post=post)
+    comment.post = another
+    comment.save()
+    assert Post.objects.get(pk=post.pk).comment_count == 1
+    assert Post.objects.get(pk=another.pk).comment_count == 1
+    another.author.delete()
+    assert Post.objects.get(pk=post.pk).comment_count == 1
+
+
+def test_comment_count_does_not_go_below_zero(
+        mixer, post_with_published_location, post_of_another_author
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    Post.objects.update(comment_count=0)
+    comment.post = post_of_another_author
+    comment.save()
+    assert Post.objects.get(pk=post.pk).comment_count == 0, (
+        "Убедитесь, что рассинхронизированный счётчик не уходит ниже нуля."
+    )
+    comment.delete()
+    assert Post.objects.get(pk=post_of_another_author.pk).comment_count == 0
+
+
+def test_rebuild_comment_counts(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Post.objects.update(comment_count=0)
+    call_command("rebuild_comment_counts", batch_size=1)
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+
+def test_cascade_delete_skips_per_comment_updates(
+        mixer, monkeypatch, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    invalidated = []
+    monkeypatch.setattr(
+        page_cache, "invalidate", lambda *scopes: invalidated.append(scopes)
+    )
+    with CaptureQueriesContext(connection) as queries:
+        post.delete()
+    updates = [
+        query["sql"] for query in queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert not updates and len(invalidated) == 1, (
+        "Убедитесь, что при удалении поста его комментарии не обновляют"
+        " счётчик и не сбрасывают кэш по одному."
+    )
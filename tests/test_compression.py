@@ -0,0 +1,106 @@
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+import brotli
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from blogicum.compression import CompressionMiddleware
+
+pytestmark = [pytest.mark.django_db]
+
+
+def compress(response, accept_encoding="gzip"):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+def test_html_page_is_gzipped(client, many_posts_with_published_locations):
+    plain = client.get("/")
+    response = client.get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert response["Content-Encoding"] == "gzip", (
+        "Убедитесь, что HTML-страницы сжимаются для клиентов с gzip."
+    )
+    assert gzip.decompress(response.content) == plain.content
+    assert len(response.content) < len(plain.content) / 2
+    assert "Accept-Encoding" in response["Vary"]
+    assert not plain.has_header("Content-Encoding")
+
+
+def test_compressed_page_answers_not_modified(
+        user_client, post_with_published_location
+):
+    url = "/"
+    etag = user_client.get(url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+    assert etag.startswith("W/")
+    assert user_client.get(
+        url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_brotli_round_trip(client, many_posts_with_published_locations):
+    plain = client.get("/")
+    response = client.get("/", HTTP_ACCEPT_ENCODING="gzip, br")
+    assert response["Content-Encoding"] == "br", (
+        "Убедитесь, что клиентам с brotli ответ сжимается brotli."
+    )
+    assert brotli.decompress(response.content) == plain.content
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_vary_is_set_for_each_encoding(encoding):
+    response = compress(HttpResponse(b"a" * 1000), encoding)
+    assert response["Content-Encoding"] == encoding
+    assert response["Vary"] == "Accept-Encoding", (
+        "Убедитесь, что сжатый ответ помечен заголовком Vary: Accept-Encoding."
+    )
+
+
+def test_pages_with_csrf_token_are_not_compressed(
+        user_client, post_with_published_location
+):
+    response = user_client.get(
+        f"/posts/{post_with_published_location.id}/",
+        HTTP_ACCEPT_ENCODING="gzip, br",
+    )
+    assert b"csrfmiddlewaretoken" in response.content
+    assert not response.has_header("Content-Encoding"), (
+        "Убедитесь, что страницы с CSRF-токеном не сжимаются (BREACH)."
+    )
+
+
+def test_streaming_response_is_compressed():
+    chunks = [b"<p>%d</p>" % number * 50 for number in range(5)]
+    response = compress(StreamingHttpResponse(iter(chunks)))
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(b"".join(response.streaming_content)) == (
+        b"".join(chunks)
+    )
+
+
+def test_media_and_small_responses_are_skipped(settings):
+    image = compress(HttpResponse(b"\x89PNG" * 500, content_type="image/png"))
+    assert not image.has_header("Content-Encoding"), (
+        "Убедитесь, что уже сжатые форматы не сжимаются повторно."
+    )
+    assert not compress(HttpResponse(b"ok")).has_header("Content-Encoding")
+    settings.RESPONSE_COMPRESSION_LEVELS = {"gzip": 1, "br": 1}
+    assert compress(HttpResponse(b"a" * 1000))["Content-Encoding"] == "gzip"
+
+
+def test_benchmark_compression(many_posts_with_published_locations):
+    stdout = io.StringIO()
+    call_command(
+        "benchmark_compression", gzip_levels=[1, 9], repeat=1,
+        stdout=stdout, stderr=io.StringIO(),
+    )
+    results = json.loads(stdout.getvalue())
+    assert {"index", "post_detail", "feed_rss"} <= results.keys()
+    index = results["index"]
+    assert index["gzip-9"]["bytes"] <= index["gzip-1"]["bytes"] < (
+        index["bytes"]
+    )
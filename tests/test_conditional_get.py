@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db, pytest.mark.page_cache]
+
+
+def test_detail_answers_not_modified(
+        user_client, mixer, post_with_published_location,
+        django_assert_max_num_queries
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = user_client.get(url)
+    etag = response["ETag"]
+    assert not response.has_header("Last-Modified")
+    with django_assert_max_num_queries(3):
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что неизменившийся пост отдаётся ответом 304."
+    )
+    assert not response.content
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий меняет ETag поста."
+    )
+    assert response["ETag"] != etag
+
+
+def test_feed_etag_follows_page_posts(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get("/")
+    etag = response["ETag"]
+    assert not response.has_header("Last-Modified"), (
+        "Убедитесь, что списки постов проверяются только по ETag."
+    )
+    response = user_client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert user_client.get(
+        "/?page=2", HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.OK
+    post = many_posts_with_published_locations[0]
+    post.location.name = "Новое место"
+    post.location.save()
+    assert user_client.get(
+        "/", HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.OK, (
+        "Убедитесь, что изменение местоположения поста меняет ETag ленты."
+    )
+
+
+def test_cached_page_answers_not_modified_without_queries(
+        client, post_with_published_location, django_assert_num_queries
+):
+    etag = client.get("/")["ETag"]
+    with django_assert_num_queries(0):
+        response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_hidden_post_is_not_revalidated(
+        client, settings, post_with_published_location
+):
+    settings.PAGE_CACHE_TIMEOUT = 0
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    etag = client.get(url)["ETag"]
+    type(post).objects.filter(pk=post.pk).update(is_visible=False)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что на условный запрос к скрытому посту "
+        "отвечается 404, а не 304."
+    )
+
+
+def test_if_modified_since_does_not_hide_related_changes(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    post.category.title = "Новая категория"
+    post.category.save()
+    post.location.name = "Новое место"
+    post.location.save()
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE="Fri, 31 Dec 2099 23:59:59 GMT"
+    )
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что страница поста не отвечает 304 по If-Modified-Since:"
+        " на ней выводятся категория и местоположение со своими изменениями."
+    )
+    assert "Новое место" in response.content.decode()
@@ -0,0 +1,31 @@
+from collections import Counter
+from random import Random
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.management.commands.generate_dataset import zipf_index
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_zipf_index_is_skewed_and_bounded():
+    rng = Random(1)
+    counts = Counter(zipf_index(100, 1.1, rng) for _ in range(10_000))
+    assert set(counts) <= set(range(100))
+    assert counts[0] > counts[10] > counts[90]
+
+
+def test_generate_dataset(capsys):
+    call_command(
+        "generate_dataset", users=5, categories=3, locations=2, posts=40,
+        comments=120, batch_size=16, seed=1, scheduled_share=0.25,
+        unpublished_share=0.25,
+    )
+    assert Post.objects.count() == 40
+    assert Comment.objects.count() == 120
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists()
+    assert Post.objects.filter(is_published=False).exists()
+    assert sum(Post.objects.values_list("comment_count", flat=True)) == 120
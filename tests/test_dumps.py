@@ -0,0 +1,84 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import dumps, page_cache
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_json_array_is_read_incrementally():
+    records = [{"model": "blog.location", "pk": pk} for pk in range(50)]
+    stream = io.StringIO(json.dumps(records, indent=2))
+    assert list(dumps.iter_json_array(stream, chunk_size=7)) == records
+
+
+@pytest.mark.parametrize("dump_format", ["ndjson", "json"])
+def test_export_import_round_trip(
+        tmp_path, mixer, post_with_published_location, dump_format
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    path = str(tmp_path / f"dump.{dump_format}")
+    call_command("export_blog", path, dump_format=dump_format, chunk_size=2)
+    created_at = [comment.created_at for comment in comments]
+    updated_at = Post.objects.get(pk=post.pk).updated_at
+    for model in dumps.MODELS:
+        model.objects.all().delete()
+
+    call_command("import_blog", path, batch_size=2, stdout=io.StringIO())
+    post = Post.objects.get(pk=post.pk)
+    assert post.is_visible and post.comment_count == 3, (
+        "Убедитесь, что после загрузки пересчитываются видимость постов и"
+        " счётчики комментариев."
+    )
+    assert list(
+        Comment.objects.order_by("pk").values_list("created_at", flat=True)
+    ) == created_at, "Убедитесь, что даты из дампа не заменяются текущими."
+    assert post.updated_at == updated_at
+    assert Post._meta.get_field("updated_at").auto_now, (
+        "Убедитесь, что загрузка не меняет флаги auto_now полей модели."
+    )
+
+
+def test_import_uses_bulk_inserts(tmp_path):
+    records = [
+        {"model": "blog.location", "pk": pk, "fields": {"name": f"М{pk}"}}
+        for pk in range(1, 11)
+    ] + [{"model": "sessions.session", "pk": "x", "fields": {}}]
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(records))
+    importer = dumps.Importer(batch_size=4)
+    with path.open() as stream, CaptureQueriesContext(connection) as context:
+        importer.load(dumps.read_records(stream))
+    inserts = [
+        query for query in context.captured_queries
+        if query["sql"].startswith("INSERT")
+    ]
+    assert len(inserts) == 3, "Объекты должны сохраняться пачками."
+    assert (importer.loaded, importer.skipped) == (10, 1)
+
+
+def test_import_invalidates_pages_on_commit(
+        tmp_path, django_capture_on_commit_callbacks
+):
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps([
+        {"model": "blog.location", "pk": 1, "fields": {"name": "Место"}}
+    ]))
+    version = page_cache.get_version("location:1")
+    with django_capture_on_commit_callbacks() as callbacks:
+        with path.open() as stream:
+            dumps.Importer().load(dumps.read_records(stream))
+        assert page_cache.get_version("location:1") == version, (
+            "Убедитесь, что кэш страниц сбрасывается только после коммита"
+            " загрузки."
+        )
+    for callback in callbacks:
+        callback()
+    assert page_cache.get_version("location:1") != version
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.edge import INCLUDE_RE
+
+pytestmark = [pytest.mark.django_db, pytest.mark.page_cache]
+
+
+def test_owner_controls_are_personal_on_shared_page(
+        user_client, another_user_client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=post.author)
+    url = f"/posts/{post.id}/"
+    edit_post = f"/posts/{post.id}/edit/"
+    edit_comment = f"/posts/{post.id}/edit_comment/{comment.id}/"
+    content = user_client.get(url).content.decode()
+    assert edit_post in content and edit_comment in content
+    response = another_user_client.get(url)
+    assert "blog/detail.html" not in [
+        template.name for template in response.templates
+    ], "Страница должна браться из кэша."
+    content = response.content.decode()
+    assert edit_post not in content and edit_comment not in content, (
+        "Убедитесь, что кнопки автора не попадают в общее тело страницы."
+    )
+    assert 'name="csrfmiddlewaretoken"' in content, (
+        "Убедитесь, что форма комментария подставляется отдельным"
+        " фрагментом."
+    )
+    assert not INCLUDE_RE.search(response.content)
+
+
+def test_etag_differs_per_user(
+        user_client, another_user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = user_client.get(url)["ETag"]
+    assert another_user_client.get(url)["ETag"] != etag
+    assert another_user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.OK
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_hidden_post_is_not_shared(client, mixer, user_client, user):
+    post = mixer.blend("blog.Post", author=user, is_published=False)
+    url = f"/posts/{post.id}/"
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что снятый с публикации пост не попадает в общий кэш."
+    )
+
+
+def test_includes_are_left_for_frontend(
+        client, settings, post_with_published_location
+):
+    settings.EDGE_INCLUDES_IN_PROCESS = False
+    response = client.get("/")
+    urls = [url.decode() for url in INCLUDE_RE.findall(response.content)]
+    assert urls == ["/fragments/header/"]
+    assert "Войти" in client.get(urls[0]).content.decode()
+
+
+def test_comment_controls_are_one_fragment_per_page(
+        client, settings, mixer, post_with_published_location
+):
+    settings.EDGE_INCLUDES_IN_PROCESS = False
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    response = client.get(f"/posts/{post.id}/")
+    urls = [url.decode() for url in INCLUDE_RE.findall(response.content)]
+    assert urls.count(f"/posts/{post.id}/comments/") == 1, (
+        "Убедитесь, что комментарии страницы с кнопками автора"
+        " подставляются одним фрагментом."
+    )
+    assert len(urls) == 4, (
+        "Убедитесь, что на каждый комментарий не приходится отдельный"
+        " фрагмент."
+    )
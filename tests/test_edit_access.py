@@ -0,0 +1,49 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def selects_from(queries, table):
+    return [
+        query for query in queries
+        if query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+    ]
+
+
+@pytest.mark.parametrize("action", ["edit", "delete"])
+def test_post_is_loaded_once(user, user_client, mixer, action):
+    post = mixer.blend("blog.Post", author=user)
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(f"/posts/{post.id}/{action}/")
+    assert response.status_code == 200
+    assert len(selects_from(context.captured_queries, "blog_post")) == 1, (
+        "Убедитесь, что при редактировании и удалении пост загружается "
+        "из базы данных один раз."
+    )
+
+
+def test_comment_and_post_are_loaded_once(user, user_client, mixer):
+    comment = mixer.blend("blog.Comment", author=user)
+    url = f"/posts/{comment.post_id}/edit_comment/{comment.id}/"
+    with CaptureQueriesContext(connection) as context:
+        user_client.post(url, data={"text": "Новый текст"})
+    queries = context.captured_queries
+    assert len(selects_from(queries, "blog_comment")) == 1
+    assert not selects_from(queries, "blog_post"), (
+        "Убедитесь, что при изменении комментария пост не загружается "
+        "повторно."
+    )
+    comment.refresh_from_db()
+    assert comment.text == "Новый текст"
+
+
+def test_comment_of_another_post_is_not_found(user, user_client, mixer):
+    comment = mixer.blend("blog.Comment", author=user)
+    other = mixer.blend("blog.Post")
+    response = user_client.get(
+        f"/posts/{other.id}/edit_comment/{comment.id}/"
+    )
+    assert response.status_code == 404
@@ -0,0 +1,62 @@
+from http import HTTPStatus
+from xml.sax.saxutils import escape
+
+import pytest
+
+pytestmark = [pytest.mark.django_db, pytest.mark.page_cache]
+
+
+def test_global_feed_is_cached_and_conditional(
+        client, post_with_published_location, django_assert_num_queries
+):
+    post = post_with_published_location
+    response = client.get("/feed/rss/")
+    assert response["Content-Type"].startswith("application/rss+xml")
+    assert escape(post.title) in response.content.decode()
+    assert response.has_header("Last-Modified")
+    with django_assert_num_queries(0):
+        cached = client.get("/feed/rss/")
+    assert cached.content == response.content, (
+        "Убедитесь, что XML ленты берётся из кэша."
+    )
+    response = client.get("/feed/rss/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_feed_cache_is_invalidated_by_post_changes(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/feed/atom/")
+    post.title = "Обновлённый заголовок"
+    post.save()
+    content = client.get("/feed/atom/").content.decode()
+    assert "Обновлённый заголовок" in content, (
+        "Убедитесь, что кэш ленты сбрасывается при изменении поста."
+    )
+    post.is_published = False
+    post.save()
+    assert "Обновлённый заголовок" not in client.get(
+        "/feed/atom/"
+    ).content.decode()
+
+
+def test_category_and_author_feeds(
+        client, user, another_user, post_with_published_location,
+        post_of_another_author
+):
+    post, other = post_with_published_location, post_of_another_author
+    content = client.get(
+        f"/profile/{user.username}/feed/atom/"
+    ).content.decode()
+    assert escape(post.title) in content
+    assert escape(other.title) not in content, (
+        "Убедитесь, что в ленте автора только его публикации."
+    )
+    content = client.get(
+        f"/category/{post.category.slug}/feed/rss/"
+    ).content.decode()
+    assert escape(post.title) in content and escape(other.title) in content
+    assert client.get(
+        "/category/unknown/feed/rss/"
+    ).status_code == HTTPStatus.NOT_FOUND
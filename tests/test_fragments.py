@@ -0,0 +1,43 @@
+import pytest
+from django.core.cache import cache
+
+from blog.fragments import card_key
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_cards_are_read_with_single_get_many(
+        user_client, many_posts_with_published_locations, monkeypatch
+):
+    user_client.get("/")
+    calls = []
+    get_many = cache.get_many
+    monkeypatch.setattr(
+        cache, "get_many", lambda keys: calls.append(keys) or get_many(keys)
+    )
+    response = user_client.get("/")
+    calls = [
+        keys for keys in calls
+        if any(key.startswith("blog:card:") for key in keys)
+    ]
+    assert len(calls) == 1 and len(calls[0]) == 10, (
+        "Убедитесь, что карточки страницы читаются из кэша одним get_many."
+    )
+    assert len(response.context["post_cards"]) == 10
+
+
+def test_card_key_follows_displayed_state(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    key = card_key(post)
+    mixer.blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert card_key(post) != key, "Ключ должен учитывать число комментариев."
+    key = card_key(post)
+    post.location.is_published = False
+    assert card_key(post) != key, "Ключ должен учитывать видимость места."
+    key = card_key(post)
+    post.title = "Другой заголовок"
+    post.save()
+    assert card_key(post) != key, "Ключ должен меняться при правке поста."
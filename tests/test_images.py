@@ -0,0 +1,97 @@
+from concurrent.futures import Future
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from django.core.files.images import ImageFile
+from django.core.files.storage import FileSystemStorage
+
+from blog import images
+from blog.images import WEBP, variant_names
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_large_image(
+        mixer, user, published_category, settings,
+        django_capture_on_commit_callbacks
+):
+    settings.IMAGE_VARIANT_WORKERS = 0
+    img_io = BytesIO()
+    Image.new("RGB", (1400, 700), color=(73, 109, 137)).save(
+        img_io, format="JPEG"
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        post = mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            image=ImageFile(img_io, name="large_image.jpg"),
+        )
+    return post
+
+
+def _variant_paths(post):
+    return [
+        Path(post.image.storage.path(name))
+        for _, _, name in variant_names(post.image.name)
+    ]
+
+
+def test_variants_are_generated_and_rendered(
+        client, monkeypatch, post_with_large_image
+):
+    post = post_with_large_image
+    post.refresh_from_db()
+    assert post.image_variants == 1280
+    for path in _variant_paths(post):
+        assert path.exists(), f"Не создан вариант изображения {path.name}."
+    with Image.open(_variant_paths(post)[0]) as variant:
+        assert variant.width == 640
+
+    def exists(name):
+        raise AssertionError(
+            "Убедитесь, что srcset строится без обращений к хранилищу."
+        )
+
+    monkeypatch.setattr(FileSystemStorage, "exists", exists)
+    content = client.get("/").content.decode()
+    assert 'type="image/webp"' in content
+    assert f".640w.{WEBP} 640w" in content
+    assert 'sizes="' in content
+
+
+def test_variants_are_removed_with_post(
+        post_with_large_image, django_capture_on_commit_callbacks
+):
+    post = post_with_large_image
+    paths = _variant_paths(post)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert not any(path.exists() for path in paths), (
+        "Убедитесь, что варианты изображения удаляются вместе с оригиналом."
+    )
+
+
+def test_failed_variants_are_logged_and_not_stored(
+        post_with_large_image, caplog
+):
+    post = post_with_large_image
+    Post.objects.filter(pk=post.pk).update(image_variants=0)
+    future = Future()
+    future.set_exception(OSError("cannot identify image file"))
+    images.finish_variants(
+        lambda width: Post.objects.filter(pk=post.pk).update(
+            image_variants=width
+        ),
+        future,
+    )
+    post.refresh_from_db()
+    assert post.image_variants == 0, (
+        "Убедитесь, что при ошибке нарезки пост не помечается как имеющий"
+        " варианты изображения."
+    )
+    assert "cannot identify image file" in caplog.text
@@ -0,0 +1,42 @@
+import re
+
+import pytest
+
+from blog import instrumentation
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_server_timing_header(
+        user_client, settings, post_with_published_location
+):
+    settings.SERVER_TIMING_HEADER = True
+    response = user_client.get(f"/posts/{post_with_published_location.id}/")
+    header = response["Server-Timing"]
+    assert re.search(r'db;dur=[\d.]+;desc="[1-9]\d* queries"', header)
+    assert re.search(r"tpl;dur=[\d.]+", header)
+    assert re.search(r"total;dur=[\d.]+", header)
+
+
+def test_server_timing_header_can_be_disabled(client, settings):
+    settings.SERVER_TIMING_HEADER = False
+    assert "Server-Timing" not in client.get("/"), (
+        "Убедитесь, что заголовок Server-Timing отдаётся только при"
+        " включённой настройке SERVER_TIMING_HEADER."
+    )
+
+
+def test_metrics_endpoint_is_admin_only(
+        client, user_client, admin_client, post_with_published_location
+):
+    instrumentation.reset()
+    client.get("/")
+    assert user_client.get("/admin/metrics/").status_code == 302
+    metrics = admin_client.get("/admin/metrics/").json()
+    assert metrics["blog:index"]["total"]["count"] == 1
+    assert metrics["blog:index"]["queries"]["count"] == 1
+    buckets = metrics["blog:index"]["queries"]["buckets"]
+    assert list(buckets)[:3] == ["1", "2", "3"], (
+        "Убедитесь, что число запросов раскладывается по своим корзинам,"
+        " а не по корзинам миллисекунд."
+    )
@@ -0,0 +1,62 @@
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import OutboxEmail
+from blog.outbox import MAX_ATTEMPTS, drain_outbox
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def locmem_email(settings):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+
+def test_post_creation_enqueues_mail(
+        user_client, user, published_category, locmem_email
+):
+    user.email = "author@example.com"
+    user.save()
+    user_client.post("/posts/create/", data={
+        "title": "Заголовок",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": published_category.id,
+    })
+    assert not mail.outbox, "Письмо не должно отправляться во время запроса."
+    assert OutboxEmail.objects.filter(recipient=user.email).exists()
+    call_command("send_outbox")
+    assert [message.to for message in mail.outbox] == [[user.email]]
+    assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+
+
+class BrokenConnection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def send_messages(self, messages):
+        raise OSError("connection refused")
+
+
+def test_failed_mail_is_retried_with_backoff(mixer):
+    email = mixer.blend("blog.OutboxEmail", recipient="reader@example.com")
+    assert drain_outbox(connection=BrokenConnection()) == 0
+    email.refresh_from_db()
+    assert email.attempts == 1
+    assert email.sent_at is None
+    assert email.send_after > timezone.now()
+    assert "connection refused" in email.last_error
+    assert drain_outbox(connection=BrokenConnection()) == 0, (
+        "Письмо не должно отправляться повторно до истечения задержки."
+    )
+    OutboxEmail.objects.update(
+        send_after=timezone.now(), attempts=MAX_ATTEMPTS
+    )
+    assert drain_outbox(connection=BrokenConnection()) == 0
+    email.refresh_from_db()
+    assert email.attempts == MAX_ATTEMPTS
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import fragments, page_cache
+from blog.models import Post
+from conftest import invalidate_in_another_process
+
+pytestmark = [pytest.mark.django_db, pytest.mark.page_cache]
+
+
+def test_anonymous_feed_is_served_from_cache(
+        client, post_with_published_location, django_assert_num_queries
+):
+    client.get("/")
+    with django_assert_num_queries(0):
+        response = client.get("/")
+    assert post_with_published_location.title in response.content.decode()
+
+
+def test_cache_is_invalidated_by_changes(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    client.get(f"/posts/{post.id}/")
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in client.get("/").content.decode()
+    mixer.blend("blog.Comment", post=post, text="Свежий комментарий")
+    assert "Свежий комментарий" in client.get(
+        f"/posts/{post.id}/"
+    ).content.decode()
+    post.location.name = "Новое место"
+    post.location.save()
+    assert "Новое место" in client.get("/").content.decode()
+    post.category.is_published = False
+    post.category.save()
+    assert post.title not in client.get("/").content.decode()
+
+
+def test_authenticated_users_share_cached_body(
+        client, user_client, another_user, post_with_published_location,
+        django_assert_max_num_queries
+):
+    client.get("/")
+    with django_assert_max_num_queries(2):
+        response = user_client.get("/")
+    assert "blog/index.html" not in [t.name for t in response.templates], (
+        "Убедитесь, что общее тело страницы из кэша отдаётся и"
+        " авторизованным пользователям."
+    )
+    content = response.content.decode()
+    assert "Выйти" in content and "Войти" not in content, (
+        "Убедитесь, что шапка страницы из кэша персональна."
+    )
+
+
+def test_cache_expires_with_scheduled_post(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    assert post.title not in client.get("/").content.decode()
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    call_command("publish_scheduled")
+    assert post.title in client.get("/").content.decode(), (
+        "Убедитесь, что кэш ленты сбрасывается, когда наступает время "
+        "отложенной публикации."
+    )
+
+
+def test_page_changed_during_render_is_not_cached(
+        client, monkeypatch, post_with_published_location
+):
+    post = post_with_published_location
+    render_cards = fragments.render_cards
+
+    def render_cards_and_comment(posts):
+        cards = render_cards(posts)
+        Post.objects.filter(pk=post.pk).update(comment_count=5)
+        page_cache.invalidate(f"post:{post.pk}")
+        return cards
+
+    monkeypatch.setattr(fragments, "render_cards", render_cards_and_comment)
+    client.get("/")
+    monkeypatch.setattr(fragments, "render_cards", render_cards)
+    response = client.get("/")
+    assert "blog/index.html" in [t.name for t in response.templates], (
+        "Убедитесь, что страница, данные которой изменились во время"
+        " отрисовки, не сохраняется в кэш."
+    )
+
+
+def test_cache_is_invalidated_by_another_worker(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get(f"/posts/{post.id}/")
+    Post.objects.filter(pk=post.pk).update(title="Заголовок из воркера")
+    invalidate_in_another_process(f"post:{post.pk}")
+    assert "Заголовок из воркера" in client.get(
+        f"/posts/{post.id}/"
+    ).content.decode(), (
+        "Убедитесь, что сброс кэша в одном воркере виден остальным: кэш"
+        " страниц должен быть общим для всех процессов."
+    )
@@ -0,0 +1,150 @@
+import base64
+import json
+import re
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.paginators import encode_cursor
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(N_PER_PAGE * 7).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(hours=n) for n in range(N_PER_PAGE * 7)),
+    )
+
+
+def _next_link(content):
+    match = re.search(r'href="\?(cursor=[^"]+|page=\d+)">\s*>>', content)
+    return match and match.group(1)
+
+
+def test_cursor_walks_whole_feed(client, feed_posts):
+    seen = []
+    query = "page=1"
+    while query:
+        response = client.get(f"/?{query}")
+        assert response.status_code == 200
+        seen.extend(post.id for post in response.context["page_obj"])
+        query = _next_link(response.content.decode())
+    expected = [post.id for post in sorted(
+        feed_posts, key=lambda p: (p.pub_date, p.id), reverse=True
+    )]
+    assert seen == expected, (
+        "Убедитесь, что переход по ссылкам пагинатора обходит ленту целиком"
+        " и без повторов."
+    )
+
+
+def test_cursor_pages_skip_count(
+        client, feed_posts, django_assert_num_queries, settings
+):
+    settings.PAGE_CACHE_TIMEOUT = 0
+    response = client.get("/?page=5")
+    cursor = response.context["page_obj"].next_cursor
+    assert cursor, "После первых страниц пагинатор должен выдавать курсор."
+    with django_assert_num_queries(1) as queries:
+        client.get(f"/?cursor={cursor}")
+    assert "OFFSET" not in queries.captured_queries[0]["sql"], (
+        "Убедитесь, что страницы по курсору не используют OFFSET и COUNT."
+    )
+
+
+def test_last_and_previous_cursor(client, feed_posts):
+    response = client.get("/")
+    last = response.context["paginator"].last_cursor
+    page = client.get(f"/?cursor={last}").context["page_obj"]
+    oldest = min(feed_posts, key=lambda p: (p.pub_date, p.id))
+    assert page[-1].id == oldest.id
+    assert not page.has_next()
+    previous = client.get(f"/?cursor={page.previous_cursor}")
+    assert previous.context["page_obj"][-1].pub_date > page[0].pub_date
+
+
+def test_invalid_cursor_is_not_found(client):
+    assert client.get("/?cursor=not-a-cursor").status_code == 404
+
+
+@pytest.mark.parametrize("data", [
+    {"d": "2024-01-01T00:00:00+00:00", "i": 10 ** 30},
+    {"d": "2024-01-01T00:00:00+00:00", "i": -1},
+    {"d": "9999-12-31T23:59:59+00:00", "i": 1e400},
+])
+def test_out_of_range_cursor_is_not_found(client, data):
+    token = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+    assert client.get(f"/?cursor={token}").status_code == 404, (
+        "Убедитесь, что курсор со значениями вне допустимых диапазонов "
+        "приводит к ответу 404."
+    )
+
+
+def test_numbered_pages_reuse_cached_count(
+        client, feed_posts, django_assert_num_queries, settings
+):
+    settings.PAGE_CACHE_TIMEOUT = 0
+    client.get("/?page=2")
+    with django_assert_num_queries(1):
+        response = client.get("/?page=3")
+    assert list(response.context["page_obj"].page_window) == [1, 2, 3, 4, 5]
+    assert "?page=6" not in response.content.decode(), (
+        "Убедитесь, что пагинатор выводит только окно страниц вокруг текущей."
+    )
+
+
+def test_comments_are_paginated_by_cursor(
+        client, mixer, post_with_published_location
+):
+    from blog.views import COMMENTS_PER_PAGE
+
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        "blog.Comment", post=post
+    )
+    response = client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    first_page = [c.id for c in comments][:COMMENTS_PER_PAGE]
+    assert [c.id for c in page] == first_page, (
+        "Убедитесь, что на странице поста выводится первая страница "
+        "комментариев."
+    )
+    assert f"Комментарии ({len(comments)})" in response.content.decode()
+    fragment = client.get(
+        f"/posts/{post.id}/comments/?cursor={page.next_cursor}"
+    )
+    content = fragment.content.decode()
+    assert "<html" not in content, (
+        "Убедитесь, что следующие страницы комментариев отдаются фрагментом."
+    )
+    assert all(f"comment_{c.id}\"" in content for c in comments[-5:])
+    assert f"comment_{comments[0].id}\"" not in content
+    assert fragment.context["comments"].next_cursor is None
+    assert fragment.context["comments"].previous_cursor is None, (
+        "Убедитесь, что комментарии не выдают обратных курсоров: назад"
+        " они не листаются."
+    )
+    assert client.get(
+        f"/posts/{post.id}/comments/?cursor={encode_cursor(reverse=True)}"
+    ).status_code == 404
+    assert "<script>" not in response.content.decode(), (
+        "Убедитесь, что скрипт подгрузки комментариев вынесен в статику."
+    )
+    assert "js/comments.js" in response.content.decode()
+
+
+def test_comments_of_hidden_post_are_not_available(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    assert client.get(f"/posts/{post.id}/comments/").status_code == 404
@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+
+from blog import instrumentation
+from blog.views import IndexViewList
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_budget_violations():
+    metrics = instrumentation.RequestMetrics()
+    for number in range(3):
+        metrics(lambda *args: None, "SELECT %s", (number,), False, {})
+    metrics(lambda *args: None, "SELECT 1", (), False, {})
+    violations = metrics.budget_violations(3)
+    assert len(violations) == 2, (
+        "Убедитесь, что учитываются и превышение бюджета, "
+        "и повторяющиеся запросы."
+    )
+    assert "SELECT %s" in violations[1]
+    assert metrics.budget_violations(None) == violations[1:]
+
+
+def test_exceeded_budget_raises(
+        client, monkeypatch, post_with_published_location
+):
+    monkeypatch.setattr(IndexViewList, "query_budget", 0)
+    with pytest.raises(instrumentation.QueryBudgetExceeded):
+        client.get("/")
+
+
+def test_exceeded_budget_is_logged(
+        client, settings, caplog, monkeypatch, post_with_published_location
+):
+    settings.QUERY_BUDGET_MODE = "log"
+    monkeypatch.setattr(IndexViewList, "query_budget", 0)
+    with caplog.at_level(logging.WARNING, logger="blog.instrumentation"):
+        assert client.get("/").status_code == 200
+    assert "blog:index" in caplog.text
+
+
+def test_sampling_can_skip_check(client, settings, monkeypatch):
+    settings.QUERY_BUDGET_SAMPLE_RATE = 0
+    monkeypatch.setattr(IndexViewList, "query_budget", 0)
+    assert client.get("/").status_code == 200
+
+
+def test_detail_has_no_n_plus_one(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    assert user_client.get(f"/posts/{post.id}/").status_code == 200, (
+        "Убедитесь, что комментарии и их авторы загружаются без N+1."
+    )
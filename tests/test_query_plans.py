@@ -0,0 +1,85 @@
+import re
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+
+from blog import views
+from blog.models import Post
+from blog.paginators import keyset_after
+from blog.visibility import visible_posts_q
+
+pytestmark = [pytest.mark.django_db]
+
+FULL_SCAN = re.compile(r"\bSCAN (TABLE )?\"?blog_(post|comment)\"?(?! USING)")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE")
+RANGE_SEARCH = re.compile(
+    r"SEARCH \"?blog_(post|comment)\"? USING INDEX .*"
+    r"(pub_date|created_at)[<>]\?"
+)
+
+
+def _view_queryset(view_cls, user, **kwargs):
+    request = RequestFactory().get("/")
+    request.user = user
+    view = view_cls()
+    view.setup(request, **kwargs)
+    return view.get_queryset()
+
+
+@pytest.fixture
+def feed_querysets(user, published_category, post_with_published_location):
+    post = post_with_published_location
+    anonymous = AnonymousUser()
+    index = _view_queryset(views.IndexViewList, anonymous)
+    return {
+        "index": index,
+        "category": _view_queryset(
+            views.BlogCategoryPosts, anonymous,
+            category_slug=published_category.slug,
+        ),
+        "profile": _view_queryset(
+            views.ProfileDetailView, anonymous, username=user.username
+        ),
+        "own_profile": _view_queryset(
+            views.ProfileDetailView, user, username=user.username
+        ),
+        "detail": _view_queryset(
+            views.BlogPostDetail, anonymous, post_id=post.id
+        ).filter(pk=post.id),
+        "index_cursor": keyset_after(
+            index, "pub_date", post.pub_date, post.pk, descending=True
+        ).order_by("-pub_date", "-pk"),
+        "index_cursor_reverse": keyset_after(
+            index, "pub_date", post.pub_date, post.pk, descending=False
+        ).order_by("pub_date", "pk"),
+        "scheduled": Post.objects.filter(
+            visible_posts_q(), is_visible=False
+        ).order_by("pub_date"),
+        "comments_cursor": keyset_after(
+            post.comments.select_related("author"), "created_at",
+            post.pub_date, 0, descending=False
+        ).order_by("created_at", "pk"),
+    }
+
+
+def test_feed_querysets_use_indexes(feed_querysets):
+    for name, queryset in feed_querysets.items():
+        plan = queryset.explain()
+        assert not FULL_SCAN.search(plan), (
+            f"Запрос `{name}` выполняет полный просмотр таблицы:\n{plan}"
+        )
+        assert not TEMP_SORT.search(plan), (
+            f"Запрос `{name}` сортирует через временное B-дерево:\n{plan}"
+        )
+
+
+def test_cursor_pages_seek_by_date(feed_querysets):
+    for name, queryset in feed_querysets.items():
+        if "cursor" not in name:
+            continue
+        plan = queryset.explain()
+        assert RANGE_SEARCH.search(plan), (
+            f"Запрос `{name}` по курсору должен искать по диапазону дат"
+            f" в индексе, а не просматривать все строки выше курсора:\n{plan}"
+        )
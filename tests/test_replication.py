@@ -0,0 +1,85 @@
+import pytest
+
+from django.conf import settings
+
+from blog import page_cache, replication
+from blog.models import Post
+from blog.routers import ReplicaRouter
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def replica_calls(settings, monkeypatch):
+    settings.REPLICA_DATABASES = ["default"]
+    calls = []
+    monkeypatch.setattr(
+        replication, "choose_replica",
+        lambda: calls.append("default") or "default"
+    )
+    return calls
+
+
+def test_router_sends_only_marked_reads_to_replica(settings):
+    settings.REPLICA_DATABASES = ["replica1"]
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) is None
+    with replication.replica_reads():
+        assert router.db_for_read(Post) == "replica1"
+        assert router.db_for_write(Post) == "default"
+    assert router.allow_migrate("replica1", "blog") is False
+    assert router.allow_migrate("default", "blog") is None
+
+
+def test_feed_reads_from_replica(client, replica_calls,
+                                 post_with_published_location):
+    client.get("/")
+    assert replica_calls, "Убедитесь, что лента читается с реплики."
+
+
+def test_reads_stick_to_primary_after_write(
+        user_client, replica_calls, post_with_published_location
+):
+    post = post_with_published_location
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Текст"}
+    )
+    assert replication.STICKY_COOKIE in response.cookies, (
+        "Убедитесь, что после записи пользователь закрепляется "
+        "за основной базой."
+    )
+    replica_calls.clear()
+    user_client.get(f"/posts/{post.id}/")
+    assert not replica_calls, (
+        "Убедитесь, что сразу после записи чтения идут в основную базу."
+    )
+
+
+def test_anonymous_reads_do_not_pin(client, replica_calls,
+                                    post_with_published_location):
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    assert replication.STICKY_COOKIE not in response.cookies
+
+
+@pytest.mark.page_cache
+def test_pages_read_from_replica_are_cached_within_lag(
+        client, replica_calls, monkeypatch, post_with_published_location
+):
+    timeouts = []
+    set_page = page_cache.set_page
+
+    def spy(*args, timeout=None):
+        timeouts.append(timeout)
+        set_page(*args, timeout=timeout)
+
+    monkeypatch.setattr(page_cache, "set_page", spy)
+    client.get("/")
+    replica_calls.clear()
+    response = client.get("/")
+    assert not replica_calls and "blog/index.html" not in [
+        t.name for t in response.templates
+    ], "Убедитесь, что страницы, прочитанные с реплики, тоже кэшируются."
+    assert timeouts == [settings.REPLICA_LAG_SECONDS], (
+        "Убедитесь, что страница с реплики хранится в кэше не дольше "
+        "допустимого отставания реплики."
+    )
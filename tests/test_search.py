@@ -0,0 +1,84 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.search import SEARCH_TABLE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    return (
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            title="Котики", text="Заметка о погоде",
+        ),
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            title="Погода", text="Пушистые котики спят на солнце",
+        ),
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            title="Собаки", text="Про собак",
+        ),
+    )
+
+
+def _found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_is_stemmed_and_ranked(client, searchable_posts):
+    title_match, text_match, _ = searchable_posts
+    assert _found(client, "котиков") == [title_match.id, text_match.id], (
+        "Убедитесь, что поиск учитывает словоформы и ставит совпадения"
+        " в заголовке выше совпадений в тексте."
+    )
+    assert _found(client, "") == []
+    assert _found(client, '"*) OR') == []
+
+
+def test_search_index_follows_changes(client, searchable_posts):
+    _, _, dog_post = searchable_posts
+    dog_post.title = "Котик и собака"
+    dog_post.save()
+    assert dog_post.id in _found(client, "котик")
+    dog_post.delete()
+    assert dog_post.id not in _found(client, "котик")
+
+
+def test_rebuild_search_index(client, searchable_posts):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+    assert _found(client, "собака") == []
+    call_command("rebuild_search_index", batch_size=2)
+    assert _found(client, "собака") == [searchable_posts[2].id]
+
+
+def test_search_matches_index_once(client, searchable_posts):
+    with CaptureQueriesContext(connection) as queries:
+        _found(client, "котиков")
+    matches = [
+        query["sql"] for query in queries if "MATCH" in query["sql"]
+    ]
+    assert matches and all(sql.count("MATCH") == 1 for sql in matches), (
+        "Убедитесь, что индекс поиска присоединяется один раз, а не"
+        " запрашивается подзапросом для каждой строки."
+    )
+
+
+def test_admin_search_keeps_rank_order(
+        admin_client, settings, searchable_posts
+):
+    # Панель шаблонов debug_toolbar печатает queryset из контекста админки.
+    settings.QUERY_BUDGET_MODE = None
+    title_match, text_match, _ = searchable_posts
+    response = admin_client.get("/admin/blog/post/", {"q": "котиков"})
+    found = [post.id for post in response.context["cl"].result_list]
+    assert found == [title_match.id, text_match.id], (
+        "Убедитесь, что поиск в админке сохраняет порядок по релевантности."
+    )
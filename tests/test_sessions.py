@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.backends.cached_db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from conftest import run_in_another_process
+
+pytestmark = [pytest.mark.django_db]
+
+
+def session_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, [
+        query["sql"] for query in context.captured_queries
+        if "django_session" in query["sql"]
+    ]
+
+
+def test_anonymous_get_does_not_touch_session(
+        client, post_with_published_location
+):
+    for url in ("/", f"/posts/{post_with_published_location.id}/"):
+        response, queries = session_queries(client, url)
+        assert not queries, (
+            "Убедитесь, что анонимные GET-запросы не читают сессию."
+        )
+        assert "sessionid" not in response.cookies, (
+            "Убедитесь, что анонимные GET-запросы не создают сессию."
+        )
+
+
+def test_session_is_read_from_cache(
+        user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    user_client.get(url)
+    response, queries = session_queries(user_client, url)
+    assert "Выйти" in response.content.decode()
+    assert not queries, (
+        "Убедитесь, что сессия авторизованного пользователя берётся из кэша."
+    )
+
+
+def test_logout_in_another_worker_ends_session(
+        user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    user_client.get(url)
+    session = user_client.session
+    run_in_another_process(
+        "from django.contrib.sessions.backends.cached_db import SessionStore; "
+        f"store = SessionStore({session.session_key!r}); "
+        "store._cache.delete(store.cache_key)"
+    )
+    Session.objects.filter(session_key=session.session_key).delete()
+    assert "Выйти" not in user_client.get(url).content.decode(), (
+        "Убедитесь, что кэш сессий общий для всех процессов: после выхода"
+        " в одном воркере сессия не должна действовать в остальных."
+    )
+
+
+def test_expired_sessions_are_purged_in_batches():
+    for _ in range(5):
+        session = SessionStore()
+        session.create()
+    active = SessionStore()
+    active.create()
+    Session.objects.exclude(session_key=active.session_key).update(
+        expire_date=timezone.now() - timedelta(days=1)
+    )
+    with CaptureQueriesContext(connection) as context:
+        call_command("purge_sessions", batch_size=2)
+    deletes = [
+        query for query in context.captured_queries
+        if query["sql"].startswith("DELETE")
+    ]
+    assert len(deletes) == 3, "Сессии должны удаляться пачками."
+    assert list(
+        Session.objects.values_list("session_key", flat=True)
+    ) == [active.session_key]
@@ -0,0 +1,41 @@
+import pytest
+from django.db import connection
+
+from blog.benchmarks import run_write_contention
+from blog.replication import copy_database
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_pragmas_are_applied_on_connect():
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        synchronous = cursor.fetchone()[0]
+        cursor.execute("PRAGMA temp_store")
+        temp_store = cursor.fetchone()[0]
+    assert (synchronous, temp_store) == (1, 2), (
+        "Убедитесь, что прагмы из OPTIONS выполняются при подключении."
+    )
+    assert connection.transaction_mode == "IMMEDIATE"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_tuned_sqlite_has_no_lock_errors(
+        tmp_path, post_with_published_location
+):
+    path = str(tmp_path / "copy.sqlite3")
+    copy_database(connection, path)
+    result = run_write_contention(
+        path,
+        {
+            "timeout": 20,
+            "transaction_mode": connection.transaction_mode,
+            "pragmas": connection.pragmas,
+        },
+        writers=4, readers=2, duration=0.3,
+    )
+    assert result["commits_per_s"] > 0
+    assert result["lock_errors"] == 0, (
+        "Убедитесь, что с WAL и BEGIN IMMEDIATE конкурентные записи "
+        "не падают с блокировкой."
+    )
@@ -0,0 +1,92 @@
+import gzip
+from pathlib import Path
+
+import brotli
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+
+from blogicum.staticfiles import PrecompressedStaticFiles
+
+STYLE = "body { color: black; }\n" * 100
+
+
+@pytest.fixture
+def collected(tmp_path, settings):
+    source = tmp_path / "source"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "site.css").write_text(STYLE)
+    settings.STATICFILES_DIRS = [source]
+    settings.STATICFILES_FINDERS = [
+        "django.contrib.staticfiles.finders.FileSystemFinder"
+    ]
+    settings.STATIC_ROOT = tmp_path / "static"
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return settings.STATIC_ROOT
+
+
+def call(application, path, **environ):
+    status = []
+    body = application(
+        {"PATH_INFO": path, "REQUEST_METHOD": "GET", **environ},
+        lambda code, headers: status.append((code, dict(headers))),
+    )
+    return status[0][0], status[0][1], b"".join(body)
+
+
+def test_collectstatic_writes_hashed_and_compressed_files(
+        collected, settings
+):
+    settings.DEBUG = False
+    url = staticfiles_storage.url("css/site.css")
+    assert url != "/static/css/site.css", (
+        "Убедитесь, что в имени собранного файла есть хэш содержимого."
+    )
+    hashed = Path(collected, url[len("/static/"):])
+    assert gzip.decompress(
+        Path(f"{hashed}.gz").read_bytes()
+    ).decode() == STYLE
+
+
+def test_wsgi_layer_serves_precompressed_files(collected, settings):
+    settings.DEBUG = False
+    calls = []
+    application = PrecompressedStaticFiles(
+        lambda environ, start_response: calls.append(environ) or []
+    )
+    url = staticfiles_storage.url("css/site.css")
+    status, headers, body = call(
+        application, url, HTTP_ACCEPT_ENCODING="gzip, deflate"
+    )
+    assert status == "200 OK" and not calls, (
+        "Убедитесь, что статика отдаётся без обращения к Django."
+    )
+    assert headers["Content-Encoding"] == "gzip"
+    assert "immutable" in headers["Cache-Control"]
+    assert gzip.decompress(body).decode() == STYLE
+    status, headers, body = call(
+        application, url, HTTP_IF_NONE_MATCH=headers["ETag"],
+        HTTP_ACCEPT_ENCODING="gzip",
+    )
+    assert status == "304 Not Modified" and not body
+    status, headers, body = call(application, "/static/css/site.css")
+    assert "Content-Encoding" not in headers and body.decode() == STYLE
+    assert "immutable" not in headers["Cache-Control"]
+    application({"PATH_INFO": "/posts/1/", "REQUEST_METHOD": "GET"}, None)
+    assert len(calls) == 1
+
+
+def test_brotli_sibling_is_written_and_served(collected, settings):
+    settings.DEBUG = False
+    url = staticfiles_storage.url("css/site.css")
+    hashed = Path(collected, url[len("/static/"):])
+    assert brotli.decompress(
+        Path(f"{hashed}.br").read_bytes()
+    ).decode() == STYLE, "Убедитесь, что рядом с файлом пишется копия .br."
+    application = PrecompressedStaticFiles(None)
+    status, headers, body = call(
+        application, url, HTTP_ACCEPT_ENCODING="gzip, deflate, br"
+    )
+    assert headers["Content-Encoding"] == "br"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert brotli.decompress(body).decode() == STYLE
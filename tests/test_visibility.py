@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.visibility import publish_scheduled
+from conftest import invalidate_in_another_process
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_visibility_follows_post_and_category(
+        mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(hours=1),
+    )
+    assert post.is_visible
+    post.is_published = False
+    post.save()
+    assert not Post.objects.get(pk=post.pk).is_visible, (
+        "Убедитесь, что снятый с публикации пост перестаёт быть видимым."
+    )
+    post.is_published = True
+    post.save()
+    published_category.is_published = False
+    published_category.save()
+    assert not Post.objects.get(pk=post.pk).is_visible, (
+        "Убедитесь, что посты снятой с публикации категории скрываются."
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert Post.objects.get(pk=post.pk).is_visible
+    published_category.delete()
+    assert not Post.objects.get(pk=post.pk).is_visible
+
+
+def test_scheduled_posts_are_published_in_batches(
+        mixer, user, published_category
+):
+    now = timezone.now()
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(minutes=5),
+    )
+    assert not any(post.is_visible for post in posts)
+    Post.objects.filter(pk__in=[post.pk for post in posts[:3]]).update(
+        pub_date=now - timedelta(minutes=1)
+    )
+    assert publish_scheduled(batch_size=2) == 3
+    assert Post.objects.filter(is_visible=True).count() == 3, (
+        "Убедитесь, что публикуются только посты с наступившим временем."
+    )
+
+
+def test_publishing_refreshes_dates_and_counts(
+        client, mixer, user, published_category, settings
+):
+    settings.PAGE_CACHE_TIMEOUT = 0
+    now = timezone.now()
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(minutes=5),
+    )
+    assert client.get("/").context["paginator"].count == 0
+    Post.objects.filter(pk=post.pk).update(pub_date=now - timedelta(minutes=1))
+    publish_scheduled()
+    assert Post.objects.get(pk=post.pk).updated_at > post.updated_at, (
+        "Убедитесь, что публикация отложенного поста обновляет updated_at."
+    )
+    assert client.get("/").context["paginator"].count == 1, (
+        "Убедитесь, что публикация сбрасывает закэшированное число постов."
+    )
+
+
+def test_rebuild_visibility(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(hours=1),
+    )
+    Post.objects.update(is_visible=False)
+    call_command("publish_scheduled", "--rebuild")
+    assert Post.objects.get(pk=post.pk).is_visible
+
+
+def test_counts_are_reset_from_another_process(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(minutes=5),
+    )
+    assert client.get("/").context["paginator"].count == 0
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1), is_visible=True
+    )
+    invalidate_in_another_process("feed")
+    assert client.get("/").context["paginator"].count == 1, (
+        "Убедитесь, что сброс кэша из manage.py publish_scheduled виден"
+        " веб-процессам: кэш должен быть общим для всех процессов."
+    )